@@ -0,0 +1,33 @@
+"""
+JSON backend shared by the adapters.
+Uses orjson (C parser, decodes bytes directly) when installed, stdlib json otherwise.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+
+    loads = orjson.loads
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+except ImportError:
+    orjson = None  # type: ignore
+    loads = json.loads
+
+    def dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+# With orjson a full decode costs about as much as a byte search of the same
+# line, so callers only pre-screen lines before decoding when it is absent.
+FAST_LOADS = orjson is not None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError; stdlib json raises
+# UnicodeDecodeError instead when handed invalid UTF-8 bytes.
+JSON_ERRORS = (json.JSONDecodeError, UnicodeDecodeError)
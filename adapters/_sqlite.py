@@ -0,0 +1,33 @@
+"""
+SQLite helpers shared by the adapters that read IDE state databases.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+# Tuning for short, read-only scans: a larger page cache, memory-mapped reads
+# (pages come straight from the OS page cache instead of a pread() each) and
+# in-memory temp storage for any sort the query needs.
+_READ_PRAGMAS = (
+    "PRAGMA query_only=1",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def connect_ro(db_path: str, check_same_thread: bool = True) -> sqlite3.Connection:
+    """
+    Open `db_path` read-only (mode=ro URI) with the read-tuning PRAGMAs applied.
+    Raises sqlite3.Error like sqlite3.connect, so callers keep their handlers.
+    Pass check_same_thread=False for connections handed between worker threads.
+    """
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=check_same_thread)
+    try:
+        for pragma in _READ_PRAGMAS:
+            conn.execute(pragma)
+    except sqlite3.Error:
+        conn.close()
+        raise
+    return conn
@@ -12,15 +12,46 @@ Standard Sniff Strategy:
 from __future__ import annotations
 
 import abc
+import hashlib
 import logging
+import re
+import sys
+import threading
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import Callable, Optional
 
 logger = logging.getLogger("openbbox.adapter")
 
+# Optional C hash for dedup fingerprints; falls back to hashlib's blake2b.
+try:
+    import xxhash
+except ImportError:
+    xxhash = None  # type: ignore
 
-@dataclass
+# Optional C ISO 8601 parser; stdlib fromisoformat otherwise.
+try:
+    from ciso8601 import parse_datetime as _ciso_parse
+except ImportError:
+    _ciso_parse = None
+
+# fromisoformat() only accepts a trailing "Z" from Python 3.11.
+_FROMISO_HANDLES_Z = sys.version_info >= (3, 11)
+
+# Optional MinHash-LSH for near-duplicate prompt removal.
+try:
+    from datasketch import MinHash, MinHashLSH
+except ImportError:
+    MinHash = MinHashLSH = None  # type: ignore
+
+# __slots__ dataclasses (no per-instance __dict__) where supported (3.10+).
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+_USER_QUERY_RE = re.compile(r"</?user_query>\s*")
+_SYS_REMINDER_RE = re.compile(r"</?system_reminder>.*?</system_reminder>", re.DOTALL)
+
+
+@dataclass(**_SLOTS)
 class RawConversation:
     """Raw prompt/response pair extracted from an IDE's local storage."""
 
@@ -34,13 +65,60 @@ class RawConversation:
     project_path: str = ""
 
     def __post_init__(self):
-        import re
-        self.prompt = re.sub(r"</?user_query>\s*", "", self.prompt).strip()
-        self.prompt = re.sub(r"</?system_reminder>.*?</system_reminder>", "", self.prompt, flags=re.DOTALL).strip()
-        self.response = re.sub(r"</?system_reminder>.*?</system_reminder>", "", self.response, flags=re.DOTALL).strip()
-
-
-@dataclass
+        # Substring probes are far cheaper than entering the regex engine, and
+        # most prompts carry neither tag.
+        prompt = self.prompt
+        if "user_query>" in prompt:
+            prompt = _USER_QUERY_RE.sub("", prompt).strip()
+        if "</system_reminder>" in prompt:
+            prompt = _SYS_REMINDER_RE.sub("", prompt)
+        self.prompt = prompt.strip()
+        if "</system_reminder>" in self.response:
+            self.response = _SYS_REMINDER_RE.sub("", self.response)
+        self.response = self.response.strip()
+
+
+# Tolerance for filesystem timestamp granularity when comparing mtime to `since`.
+_MTIME_SKEW = timedelta(seconds=1)
+
+
+def modified_before(mtime: float, since: Optional[datetime]) -> bool:
+    """
+    True if a file last modified at `mtime` (epoch seconds) cannot hold anything
+    newer than `since`, so it can be skipped without being opened.
+
+    `since` is naive UTC, but adapters fall back to the local-time mtime for
+    entries without their own timestamp, so the file only counts as stale when
+    it is older under both interpretations.
+    """
+    if since is None:
+        return False
+    newest = max(
+        datetime.fromtimestamp(mtime),
+        datetime.fromtimestamp(mtime, timezone.utc).replace(tzinfo=None),
+    )
+    return newest < since - _MTIME_SKEW
+
+
+def parse_iso_datetime(raw: str) -> datetime:
+    """
+    Parse an ISO 8601 timestamp to a naive datetime (any offset is dropped,
+    wall-clock time kept). Raises ValueError on malformed input.
+    """
+    dt = None
+    if _ciso_parse is not None:
+        try:
+            dt = _ciso_parse(raw)
+        except ValueError:
+            pass
+    if dt is None:
+        dt = datetime.fromisoformat(raw if _FROMISO_HANDLES_Z else raw.replace("Z", "+00:00"))
+    if dt.tzinfo is not None:
+        dt = dt.replace(tzinfo=None)
+    return dt
+
+
+@dataclass(**_SLOTS)
 class SniffLayer:
     """One data-source layer in a multi-layer sniff strategy."""
 
@@ -51,7 +129,21 @@ class SniffLayer:
     scan_fn: Callable[[Optional[datetime]], list[RawConversation]] = field(repr=False)
 
 
-@dataclass
+class FingerprintedConversations(list):
+    """
+    A layer's conversations plus their prompt_fingerprint() values, for
+    layers that keep fingerprints cached (e.g. per parsed file): the base
+    dedup uses them instead of hashing every prompt again.
+    """
+
+    __slots__ = ("fingerprints",)
+
+    def __init__(self, conversations=(), fingerprints=()):
+        super().__init__(conversations)
+        self.fingerprints: list[Optional[int]] = list(fingerprints)
+
+
+@dataclass(**_SLOTS)
 class LayerResult:
     """Result of scanning one layer."""
 
@@ -69,6 +161,9 @@ ProgressCallback = Callable[[dict], None]
 class BaseAdapter(abc.ABC):
     """Interface that every IDE adapter must implement."""
 
+    # Jaccard threshold for the MinHash-LSH near-duplicate pass; None disables it.
+    near_dedup_threshold: Optional[float] = None
+
     @abc.abstractmethod
     def name(self) -> str:
         """Human-readable name of this adapter (e.g. 'Cursor', 'Trae')."""
@@ -88,6 +183,12 @@ class BaseAdapter(abc.ABC):
         If since is None, return all available conversations.
         """
 
+    def close(self) -> None:
+        """
+        Release resources kept open between polls (e.g. DB connections).
+        Default: nothing to release.
+        """
+
     def get_sniff_strategy(self) -> list[SniffLayer]:
         """
         Return the ordered list of data-source layers for this adapter.
@@ -112,13 +213,28 @@ class BaseAdapter(abc.ABC):
         """
         Execute the full sniff strategy layer by layer, reporting progress.
         Returns deduplicated conversations from all layers.
+        Polls of one instance run one at a time: the registry shares instances
+        between threads, and adapters keep per-instance incremental state.
         """
+        # setdefault is atomic, so racing first polls still share one lock.
+        lock = self.__dict__.setdefault("_poll_lock", threading.RLock())
+        with lock:
+            return self._poll_layers(since, on_progress)
+
+    def _poll_layers(
+        self,
+        since: Optional[datetime],
+        on_progress: Optional[ProgressCallback],
+    ) -> list[RawConversation]:
         import time
 
         strategy = self.get_sniff_strategy()
         strategy.sort(key=lambda l: l.priority)
 
-        all_conversations: list[RawConversation] = []
+        # Each layer's output is deduplicated as it arrives against the prompts
+        # kept so far, so earlier layers win and no combined list is built.
+        unique: list[RawConversation] = []
+        seen: set[int] = set()
         total_layers = len(strategy)
 
         for idx, layer in enumerate(strategy):
@@ -137,9 +253,8 @@ class BaseAdapter(abc.ABC):
                 convos = layer.scan_fn(since)
                 elapsed = int((time.monotonic() - t0) * 1000)
 
-                projects = {c.project_name for c in convos if c.project_name}
-
                 if on_progress:
+                    projects = {c.project_name for c in convos if c.project_name}
                     on_progress({
                         "step": "layer_done",
                         "layer_name": layer.name,
@@ -148,7 +263,9 @@ class BaseAdapter(abc.ABC):
                         "elapsed_ms": elapsed,
                     })
 
-                all_conversations.extend(convos)
+                unique.extend(self._deduplicate_base(
+                    convos, seen, getattr(convos, "fingerprints", None)
+                ))
 
             except Exception as e:
                 elapsed = int((time.monotonic() - t0) * 1000)
@@ -161,16 +278,83 @@ class BaseAdapter(abc.ABC):
                         "elapsed_ms": elapsed,
                     })
 
-        return self._deduplicate_base(all_conversations)
+        if self.near_dedup_threshold is not None and len(unique) > 1:
+            unique = self._deduplicate_near(unique, self.near_dedup_threshold)
+        return unique
+
+    @staticmethod
+    def _deduplicate_base(
+        conversations: list[RawConversation],
+        seen: Optional[set[int]] = None,
+        fingerprints: Optional[list[Optional[int]]] = None,
+    ) -> list[RawConversation]:
+        """
+        Default deduplication by prompt prefix (128-bit fingerprint of prompt[:200]).
+        Pass `seen` to carry fingerprints across batches; it is updated in place.
+        Pass `fingerprints` (prompt_fingerprint() per conversation) when the
+        caller already has them, to skip hashing.
+        """
+        # Scan a flat list of prompts and mark survivors, then gather objects once.
+        # A sort-based unique (np.unique / dict-over-reversed-indices) was measured
+        # slower than this single set pass: prefix slicing dominates either way
+        # and the sort adds O(n log n) to restore first-seen order.
+        if fingerprints is None:
+            fingerprints = [prompt_fingerprint(c.prompt) for c in conversations]
+        keep = bytearray(len(fingerprints))
+        if seen is None:
+            seen = set()
+        for i, h in enumerate(fingerprints):
+            if h is None or h in seen:
+                continue
+            seen.add(h)
+            keep[i] = 1
+        return [c for c, k in zip(conversations, keep) if k]
 
     @staticmethod
-    def _deduplicate_base(conversations: list[RawConversation]) -> list[RawConversation]:
-        """Default deduplication by prompt prefix."""
-        seen: set[str] = set()
+    def _deduplicate_near(
+        conversations: list[RawConversation], threshold: float = 0.85
+    ) -> list[RawConversation]:
+        """
+        Drop near-duplicate prompts (retries with small edits) using MinHash-LSH
+        over character 3-grams of prompt[:2000]. First-seen conversation wins.
+        """
+        if MinHashLSH is None:
+            logger.warning("Near-duplicate dedup requested but datasketch is not installed")
+            return conversations
+
+        lsh = MinHashLSH(num_perm=64, params=(7, 3))
+        signatures: dict[int, MinHash] = {}
         unique: list[RawConversation] = []
-        for convo in conversations:
-            key = convo.prompt[:200].strip()
-            if key and key not in seen:
-                seen.add(key)
-                unique.append(convo)
+        for idx, convo in enumerate(conversations):
+            text = convo.prompt[:2000]
+            grams = {text[i:i + 3] for i in range(max(len(text) - 2, 1))}
+            mh = MinHash(num_perm=64)
+            mh.update_batch([g.encode("utf-8", "ignore") for g in grams])
+            if any(mh.jaccard(signatures[k]) >= threshold for k in lsh.query(mh)):
+                continue
+            lsh.insert(idx, mh)
+            signatures[idx] = mh
+            unique.append(convo)
         return unique
+
+
+def prompt_fingerprint(prompt: str) -> Optional[int]:
+    """
+    Dedup key for a prompt: a 128-bit int fingerprint of prompt[:200].strip(),
+    so a seen-set holds small ints rather than prefix strings. 128 bits keeps
+    accidental collisions (which silently drop a conversation) out of reach
+    even for multi-million-prompt histories. None for an empty key.
+    xxh3_128 with the speedups extra, blake2b-128 otherwise: both are stable
+    across processes, but the two backends give different values.
+    """
+    key = prompt[:200]
+    # Most prompts start and end their prefix on a visible character; only
+    # pay for strip() when an end is actually whitespace (or the key is empty).
+    if not key or key[0].isspace() or key[-1].isspace():
+        key = key.strip()
+        if not key:
+            return None
+    data = key.encode("utf-8", "ignore")
+    if xxhash is not None:
+        return xxhash.xxh3_128_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=16).digest(), "little")
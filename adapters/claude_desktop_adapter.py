@@ -16,6 +16,7 @@ it from Claude Code CLI.
 
 from __future__ import annotations
 
+import functools
 import logging
 import platform
 from datetime import datetime
@@ -27,6 +28,7 @@ from adapters.base import BaseAdapter, RawConversation, SniffLayer
 logger = logging.getLogger("openbbox.claude_desktop")
 
 
+@functools.lru_cache(maxsize=None)
 def _claude_desktop_path() -> Path:
     system = platform.system()
     if system == "Darwin":
@@ -39,6 +41,7 @@ def _claude_desktop_path() -> Path:
         return Path.home() / ".config" / "Claude"
 
 
+@functools.lru_cache(maxsize=None)
 def _claude_desktop_app_exists() -> bool:
     system = platform.system()
     if system == "Darwin":
@@ -33,20 +33,25 @@ The encoded path format: -Users-username-project → /Users/username/project
 
 from __future__ import annotations
 
-import json
+import functools
 import logging
 import os
 import platform
-import subprocess
+import shutil
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from adapters.base import BaseAdapter, RawConversation, SniffLayer
+from adapters._io import PREFETCH_MIN_FILES, map_threaded, prefetch
+from adapters._json import JSON_ERRORS, dumps, loads
+from adapters.base import BaseAdapter, RawConversation, SniffLayer, modified_before, parse_iso_datetime
 
 logger = logging.getLogger("openbbox.claudecode")
 
 
+@functools.lru_cache(maxsize=None)
 def _claude_base_path() -> Path:
     system = platform.system()
     if system == "Windows":
@@ -55,7 +60,67 @@ def _claude_base_path() -> Path:
     return Path.home() / ".claude"
 
 
+@functools.lru_cache(maxsize=None)
+def _claude_cli_on_path() -> bool:
+    """Whether the `claude` CLI is on PATH; fixed for the process lifetime."""
+    return shutil.which("claude") is not None
+
+
+# Directory listings are reused for this many seconds while the mtimes of
+# ~/.claude and ~/.claude/projects are unchanged.
+_FILE_INDEX_TTL = 5.0
+
+
+@dataclass
+class _ClaudeFiles:
+    """One walk of ~/.claude: session files grouped by project dir, plus root files."""
+
+    projects: list[tuple[str, list[str]]]  # (project dir name, sorted *.jsonl)
+    top_jsonl: list[str]
+    top_json: list[str]
+
+
+@dataclass
+class _JsonlTail:
+    """Parser state for a session file after `offset` bytes (always a line boundary)."""
+
+    inode: int
+    ts: datetime
+    offset: int = 0
+    prompt_buf: str = ""
+    response_parts: list[str] = field(default_factory=list)
+    done: list[RawConversation] = field(default_factory=list)
+
+
+def _list_files(directory: str | Path, suffix: str) -> list[str]:
+    """
+    Files in `directory` ending in `suffix`, hidden ones included, as
+    Path.glob("*" + suffix) returns them. Returns plain path strings; no Path
+    objects are built per entry.
+    """
+    try:
+        with os.scandir(directory) as it:
+            return [e.path for e in it if e.name.endswith(suffix) and e.is_file()]
+    except OSError:
+        return []
+
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
 class ClaudeCodeAdapter(BaseAdapter):
+    def __init__(self) -> None:
+        # path → (st_mtime_ns, st_size, conversations parsed from that file)
+        self._parse_cache: dict[str, tuple[int, int, list[RawConversation]]] = {}
+        # path → resumable parser state at the last complete line read
+        self._tail_state: dict[str, _JsonlTail] = {}
+        # ((base mtime_ns, projects mtime_ns), monotonic time of walk, result)
+        self._file_index_cache: Optional[tuple[tuple[int, int], float, _ClaudeFiles]] = None
+
     def name(self) -> str:
         return "ClaudeCode"
 
@@ -63,33 +128,47 @@ class ClaudeCodeAdapter(BaseAdapter):
         base = _claude_base_path()
         if base.exists():
             return True
-        try:
-            result = subprocess.run(
-                ["which", "claude"], capture_output=True, timeout=3
-            )
-            return result.returncode == 0
-        except (OSError, subprocess.TimeoutExpired):
-            return False
+        return _claude_cli_on_path()
 
     def get_db_paths(self) -> list[str]:
+        files = self._enumerate_files()
+        paths = [f for _, jsonls in files.projects for f in jsonls]
+        paths.extend(files.top_jsonl)
+        paths.extend(files.top_json)
+        return paths
+
+    def _enumerate_files(self) -> _ClaudeFiles:
+        """
+        Walk ~/.claude once with os.scandir. The listing is shared by get_db_paths
+        and both layers, and reused across polls within _FILE_INDEX_TTL.
+        """
         base = _claude_base_path()
         if not base.exists():
-            return []
+            return _ClaudeFiles(projects=[], top_jsonl=[], top_json=[])
 
-        paths: list[str] = []
         projects_dir = base / "projects"
-        if projects_dir.exists():
-            for project_dir in projects_dir.iterdir():
-                if project_dir.is_dir():
-                    for jsonl in project_dir.glob("*.jsonl"):
-                        paths.append(str(jsonl))
-
-        for jsonl in base.glob("*.jsonl"):
-            paths.append(str(jsonl))
-        for jf in base.glob("*.json"):
-            paths.append(str(jf))
+        stamp = (_mtime_ns(base), _mtime_ns(projects_dir))
+        now = time.monotonic()
+        cached = self._file_index_cache
+        if cached and cached[0] == stamp and now - cached[1] < _FILE_INDEX_TTL:
+            return cached[2]
 
-        return paths
+        projects: list[tuple[str, list[str]]] = []
+        try:
+            with os.scandir(projects_dir) as it:
+                dirs = [e for e in it if e.is_dir()]
+        except OSError:
+            dirs = []
+        for entry in dirs:
+            projects.append((entry.name, sorted(_list_files(entry.path, ".jsonl"))))
+
+        files = _ClaudeFiles(
+            projects=projects,
+            top_jsonl=_list_files(base, ".jsonl"),
+            top_json=_list_files(base, ".json"),
+        )
+        self._file_index_cache = (stamp, now, files)
+        return files
 
     def get_sniff_strategy(self) -> list[SniffLayer]:
         """Two layers, both always executed."""
@@ -113,33 +192,35 @@ class ClaudeCodeAdapter(BaseAdapter):
     def poll_new(self, since: Optional[datetime] = None) -> list[RawConversation]:
         return self.poll_with_progress(since=since)
 
-    def poll_with_progress(self, since=None, on_progress=None):
-        result = super().poll_with_progress(since=since, on_progress=on_progress)
-        return self._deduplicate(result)
-
     # ── Layer 1: Project Sessions ──
 
     def _layer_project_sessions(self, since: Optional[datetime] = None) -> list[RawConversation]:
         results: list[RawConversation] = []
-        projects_dir = _claude_base_path() / "projects"
-        if not projects_dir.exists():
-            return results
 
-        for project_dir in projects_dir.iterdir():
-            if not project_dir.is_dir():
-                continue
+        # (file, project_name, project_path, session_id) for every session file
+        jobs: list[tuple[str, str, str, str]] = []
+        for dir_name, jsonl_files in self._enumerate_files().projects:
+            project_path = self._decode_project_path(dir_name)
+            project_name = Path(project_path).name if project_path else dir_name
 
-            project_path = self._decode_project_path(project_dir.name)
-            project_name = Path(project_path).name if project_path else project_dir.name
+            for jsonl_file in jsonl_files:
+                jobs.append((
+                    jsonl_file, project_name, project_path,
+                    self._extract_session_id(jsonl_file),
+                ))
 
-            for jsonl_file in sorted(project_dir.glob("*.jsonl")):
-                session_id = self._extract_session_id(jsonl_file)
-                convos = self._read_jsonl(jsonl_file, since)
-                for c in convos:
-                    c.project_name = project_name
-                    c.project_path = project_path
-                    c.session_id = session_id
-                results.extend(convos)
+        if not jobs:
+            return results
+        if len(jobs) >= PREFETCH_MIN_FILES:
+            prefetch(job[0] for job in jobs)
+
+        parsed = map_threaded(lambda job: self._read_jsonl(job[0], since), jobs, max_workers=32)
+        for (_, project_name, project_path, session_id), convos in zip(jobs, parsed):
+            for c in convos:
+                c.project_name = project_name
+                c.project_path = project_path
+                c.session_id = session_id
+            results.extend(convos)
 
         logger.info("[project_sessions] Found %d conversations", len(results))
         return results
@@ -148,13 +229,11 @@ class ClaudeCodeAdapter(BaseAdapter):
 
     def _layer_top_level_files(self, since: Optional[datetime] = None) -> list[RawConversation]:
         results: list[RawConversation] = []
-        base = _claude_base_path()
-        if not base.exists():
-            return results
+        files = self._enumerate_files()
 
-        for jsonl in base.glob("*.jsonl"):
+        for jsonl in files.top_jsonl:
             results.extend(self._read_jsonl(jsonl, since))
-        for jf in base.glob("*.json"):
+        for jf in files.top_json:
             results.extend(self._read_json(jf, since))
 
         logger.info("[top_level_files] Found %d conversations", len(results))
@@ -162,73 +241,112 @@ class ClaudeCodeAdapter(BaseAdapter):
 
     # ── JSONL Parser (Claude Code format) ──
 
-    def _read_jsonl(self, path: Path, since: Optional[datetime]) -> list[RawConversation]:
+    def _read_jsonl(self, path: str | Path, since: Optional[datetime]) -> list[RawConversation]:
         """
-        Claude Code JSONL format: each line is a message object with
-        role (user/assistant/system) and content (string or content blocks).
+        Return conversations from a session file, newer than `since`.
+        Parses are cached per path and reused while (mtime, size) is unchanged:
+        closed sessions never change, so repeat polls skip them entirely.
+        An active session that only grew is parsed from where the last poll
+        stopped rather than from byte 0.
         """
-        results: list[RawConversation] = []
-        prompt_buf = ""
-        response_buf = ""
-
         try:
-            file_mtime = datetime.fromtimestamp(path.stat().st_mtime)
+            st = os.stat(path)
         except OSError:
-            file_mtime = datetime.utcnow()
-
-        ts = file_mtime
+            return []
+        if modified_before(st.st_mtime, since):
+            return []
 
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        entry = json.loads(line)
-                    except json.JSONDecodeError:
-                        continue
-
-                    role = entry.get("role", entry.get("type", ""))
-                    content = self._extract_content(entry)
-                    msg_ts = self._parse_timestamp(entry)
-
-                    if role in ("user", "human"):
-                        if prompt_buf and response_buf:
-                            if not since or ts >= since:
-                                results.append(RawConversation(
-                                    timestamp=ts,
-                                    prompt=prompt_buf,
-                                    response=response_buf,
-                                ))
-                        prompt_buf = content if content else ""
-                        response_buf = ""
-                        ts = msg_ts or file_mtime
-
-                    elif role in ("assistant", "ai"):
-                        if content:
-                            response_buf += content + "\n"
-                        tool_blocks = self._extract_tool_use(entry)
-                        if tool_blocks:
-                            response_buf += tool_blocks
-
-        except (OSError, UnicodeDecodeError) as e:
-            logger.debug("Failed to read JSONL %s: %s", path, e)
-
-        if prompt_buf and response_buf:
-            if not since or ts >= since:
-                results.append(RawConversation(
-                    timestamp=ts,
-                    prompt=prompt_buf,
-                    response=response_buf.strip(),
+        key = str(path)
+        cached = self._parse_cache.get(key)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            convos = cached[2]
+        else:
+            file_mtime = datetime.fromtimestamp(st.st_mtime)
+            # Take ownership of the tail state; a concurrent reader of the same
+            # file finds none and simply does a full parse.
+            tail = self._tail_state.pop(key, None)
+            if tail is None or tail.inode != st.st_ino or st.st_size < tail.offset:
+                tail = _JsonlTail(inode=st.st_ino, ts=file_mtime)
+
+            try:
+                with open(path, "rb") as f:
+                    f.seek(tail.offset)
+                    data = f.read()
+            except OSError as e:
+                logger.debug("Failed to read JSONL %s: %s", path, e)
+                return []
+
+            # Only whole lines advance the saved state; a partially written last
+            # line is parsed into a throwaway copy so results match a full parse.
+            cut = data.rfind(b"\n") + 1
+            self._consume_jsonl(tail, data[:cut], file_mtime)
+            tail.offset += cut
+            pending = _JsonlTail(
+                inode=tail.inode, prompt_buf=tail.prompt_buf,
+                response_parts=list(tail.response_parts), ts=tail.ts,
+            )
+            self._consume_jsonl(pending, data[cut:], file_mtime)
+            convos = tail.done + pending.done
+            if pending.prompt_buf and pending.response_parts:
+                convos.append(RawConversation(
+                    timestamp=pending.ts,
+                    prompt=pending.prompt_buf,
+                    response="".join(pending.response_parts).strip(),
                 ))
 
-        return results
+            self._tail_state[key] = tail
+            self._parse_cache[key] = (st.st_mtime_ns, st.st_size, convos)
+
+        if since:
+            return [c for c in convos if c.timestamp >= since]
+        return list(convos)
 
-    def _read_json(self, path: Path, since: Optional[datetime]) -> list[RawConversation]:
+    def _consume_jsonl(self, tail: _JsonlTail, data: bytes, file_mtime: datetime) -> None:
+        """
+        Claude Code JSONL format: each line is a message object with
+        role (user/assistant/system) and content (string or content blocks).
+        Feeds the lines in `data` through the prompt/response state in `tail`,
+        appending each conversation closed by a new user message to tail.done.
+        """
+        for line in data.split(b"\n"):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = loads(line)
+            except JSON_ERRORS:
+                continue
+
+            role = entry.get("role", entry.get("type", ""))
+            content = self._extract_content(entry)
+            msg_ts = self._parse_timestamp(entry)
+
+            if role in ("user", "human"):
+                if tail.prompt_buf and tail.response_parts:
+                    tail.done.append(RawConversation(
+                        timestamp=tail.ts,
+                        prompt=tail.prompt_buf,
+                        response="".join(tail.response_parts),
+                    ))
+                tail.prompt_buf = content if content else ""
+                tail.response_parts = []
+                tail.ts = msg_ts or file_mtime
+
+            elif role in ("assistant", "ai"):
+                if content:
+                    tail.response_parts.append(content)
+                    tail.response_parts.append("\n")
+                tool_blocks = self._extract_tool_use(entry)
+                if tool_blocks:
+                    tail.response_parts.append(tool_blocks)
+
+    def _read_json(self, path: str | Path, since: Optional[datetime]) -> list[RawConversation]:
         try:
-            data = json.loads(path.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError):
+            if modified_before(os.stat(path).st_mtime, since):
+                return []
+            with open(path, "rb") as f:
+                data = loads(f.read())
+        except (*JSON_ERRORS, OSError):
             return []
 
         if isinstance(data, list):
@@ -244,7 +362,7 @@ class ClaudeCodeAdapter(BaseAdapter):
     ) -> list[RawConversation]:
         results: list[RawConversation] = []
         prompt_buf = ""
-        response_buf = ""
+        response_parts: list[str] = []
         ts = datetime.utcnow()
 
         for msg in messages:
@@ -258,22 +376,22 @@ class ClaudeCodeAdapter(BaseAdapter):
             msg_ts = self._parse_timestamp(msg)
 
             if role in ("user", "human"):
-                if prompt_buf and response_buf:
+                if prompt_buf and response_parts:
                     if not since or ts >= since:
                         results.append(RawConversation(
-                            timestamp=ts, prompt=prompt_buf, response=response_buf
+                            timestamp=ts, prompt=prompt_buf, response="\n".join(response_parts)
                         ))
                 prompt_buf = content
-                response_buf = ""
+                response_parts = []
                 if msg_ts:
                     ts = msg_ts
             elif role in ("assistant", "ai"):
-                response_buf += content + "\n"
+                response_parts.append(content)
 
-        if prompt_buf and response_buf:
+        if prompt_buf and response_parts:
             if not since or ts >= since:
                 results.append(RawConversation(
-                    timestamp=ts, prompt=prompt_buf, response=response_buf.strip()
+                    timestamp=ts, prompt=prompt_buf, response="\n".join(response_parts).strip()
                 ))
 
         return results
@@ -308,7 +426,7 @@ class ClaudeCodeAdapter(BaseAdapter):
         for block in content:
             if isinstance(block, dict) and block.get("type") == "tool_use":
                 tool_name = block.get("name", "unknown")
-                tool_input = json.dumps(block.get("input", {}), ensure_ascii=False)[:200]
+                tool_input = dumps(block.get("input", {}))[:200]
                 parts.append(f"\n[Tool: {tool_name} — {tool_input}]")
         return "".join(parts)
 
@@ -320,10 +438,8 @@ class ClaudeCodeAdapter(BaseAdapter):
                     raw = entry[key]
                     if isinstance(raw, (int, float)):
                         return datetime.fromtimestamp(raw / 1000 if raw > 1e12 else raw)
-                    dt = datetime.fromisoformat(str(raw).replace("Z", "+00:00"))
-                    if dt.tzinfo is not None:
-                        dt = dt.replace(tzinfo=None)
-                    return dt
+                    if isinstance(raw, str):
+                        return parse_iso_datetime(raw)
                 except (ValueError, OSError):
                     pass
         return None
@@ -336,19 +452,8 @@ class ClaudeCodeAdapter(BaseAdapter):
         return encoded
 
     @staticmethod
-    def _extract_session_id(path: Path) -> str:
-        stem = path.stem
+    def _extract_session_id(path: str | Path) -> str:
+        stem = os.path.splitext(os.path.basename(path))[0]
         if stem.startswith("session-"):
             return stem.replace("session-", "")
         return stem
-
-    @staticmethod
-    def _deduplicate(conversations: list[RawConversation]) -> list[RawConversation]:
-        seen: set[str] = set()
-        unique: list[RawConversation] = []
-        for convo in conversations:
-            key = convo.prompt[:200].strip()
-            if key and key not in seen:
-                seen.add(key)
-                unique.append(convo)
-        return unique
@@ -32,23 +32,122 @@ Session JSONL format:
 
 from __future__ import annotations
 
-import json
 import logging
+import multiprocessing
 import os
+import re
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
-
-from adapters.base import BaseAdapter, RawConversation, SniffLayer
+from typing import Iterable, Optional
+
+from adapters._io import iter_lines, walk_files
+from adapters._json import FAST_LOADS, JSON_ERRORS, loads
+from adapters.base import (
+    BaseAdapter,
+    FingerprintedConversations,
+    RawConversation,
+    SniffLayer,
+    modified_before,
+    parse_iso_datetime,
+    prompt_fingerprint,
+)
 
 logger = logging.getLogger("openbbox.codex")
 
+# Process-pool parsing only pays for its pickling above this many files.
+_PARALLEL_MIN_FILES = 8
+
+# Parse workers, started on first use and shared by every poll. Polls run on
+# worker threads, so the children come from forkserver/spawn, never a fork of
+# a threaded process.
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+# Codex writes each line as {"timestamp":..,"type":..,"payload":{"type":..,..}}.
+# Only message items, user_message events and session_meta feed the parser.
+_WANTED_TYPES = (b"response_item", b"event_msg", b"session_meta")
+# response_item payloads that never carry a role (tool calls and their output, reasoning).
+_ROLELESS_ITEMS = (
+    b"reasoning", b"function_call", b"function_call_output", b"custom_tool_call",
+    b"custom_tool_call_output", b"local_shell_call", b"web_search_call",
+)
+
+
+def _alternation(words: Iterable[bytes]) -> bytes:
+    return b"(?:" + b"|".join(re.escape(w) for w in words) + b")"
+
+
+# Built from the tables above: matches the head of a line in that layout which
+# cannot contribute, so the per-line skip test is a single anchored C match.
+_SKIP_LINE_RE = re.compile(
+    rb'\{"timestamp":"[^"]*","type":"(?:'
+    rb'(?!' + _alternation(_WANTED_TYPES) + rb'")'
+    rb'|event_msg","payload":\{"type":"(?!user_message")'
+    rb'|response_item","payload":\{"type":"' + _alternation(_ROLELESS_ITEMS) + rb'"'
+    rb')'
+)
+
 
 def _codex_base_path() -> Path:
     return Path.home() / ".codex"
 
 
+@dataclass
+class _RolloutState:
+    """Parser state for a rollout file after `offset` bytes (always a line boundary)."""
+
+    inode: int
+    offset: int = 0
+    cwd: str = ""
+    model: str = ""
+    user_msg: str = ""
+    assistant_parts: list[str] = field(default_factory=list)
+    ts: Optional[datetime] = None
+
+
+def _parse_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context(method),
+            )
+        return _pool
+
+
+def _drop_parse_pool(pool: ProcessPoolExecutor) -> None:
+    """Forget a failed pool so the next large batch starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+# (advanced state, conversations closed by the new lines, unfinished tail)
+_ParseResult = tuple[_RolloutState, list[RawConversation], list[RawConversation]]
+
+
 class CodexAdapter(BaseAdapter):
+    def __init__(self) -> None:
+        # path → (st_mtime_ns, st_size, conversations parsed from that file,
+        #         their prompt fingerprints as a parallel column)
+        self._parse_cache: dict[
+            str, tuple[int, int, list[RawConversation], list[Optional[int]]]
+        ] = {}
+        # path → (resumable parser state, conversations closed before it)
+        self._tail_state: dict[str, tuple[_RolloutState, list[RawConversation]]] = {}
+
     def name(self) -> str:
         return "Codex"
 
@@ -60,8 +159,7 @@ class CodexAdapter(BaseAdapter):
         paths: list[str] = []
         sessions_dir = _codex_base_path() / "sessions"
         if sessions_dir.exists():
-            for jsonl in sessions_dir.rglob("*.jsonl"):
-                paths.append(str(jsonl))
+            paths.extend(walk_files(sessions_dir, ".jsonl"))
         sqlite_db = _codex_base_path() / "sqlite" / "codex-dev.db"
         if sqlite_db.exists():
             paths.append(str(sqlite_db))
@@ -81,108 +179,220 @@ class CodexAdapter(BaseAdapter):
     def poll_new(self, since: Optional[datetime] = None) -> list[RawConversation]:
         return self.poll_with_progress(since=since)
 
-    def poll_with_progress(self, since=None, on_progress=None):
-        result = super().poll_with_progress(since=since, on_progress=on_progress)
-        return self._deduplicate(result)
-
     # ── Layer 1: Session JSONL ──
 
     def _layer_session_jsonl(self, since: Optional[datetime] = None) -> list[RawConversation]:
-        results: list[RawConversation] = []
+        """
+        Parses are cached per file and reused while (mtime, size) is unchanged,
+        so closed rollouts cost one stat per poll. A rollout that only grew is
+        parsed from where the last poll stopped rather than from byte 0.
+        """
         sessions_dir = _codex_base_path() / "sessions"
         if not sessions_dir.exists():
-            return results
-
-        for jsonl_file in sessions_dir.rglob("*.jsonl"):
-            convos = self._parse_session_file(jsonl_file, since)
-            results.extend(convos)
+            return []
+
+        files = list(walk_files(sessions_dir, ".jsonl"))
+        per_file: list[tuple[list[RawConversation], list[Optional[int]]]] = []
+        misses: list[tuple[int, str, os.stat_result]] = []
+        for path in files:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            # Prune per file rather than per {Y}/{M}/{D} partition: a resumed
+            # session keeps appending to its rollout in the original day dir.
+            if modified_before(st.st_mtime, since):
+                continue
+            cached = self._parse_cache.get(path)
+            if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                per_file.append((cached[2], cached[3]))
+            else:
+                misses.append((len(per_file), path, st))
+                per_file.append(([], []))
+
+        if misses:
+            states: list[_RolloutState] = []
+            for _, key, st in misses:
+                entry = self._tail_state.get(key)
+                if entry is None or entry[0].inode != st.st_ino or st.st_size < entry[0].offset:
+                    entry = (_RolloutState(inode=st.st_ino), [])
+                    self._tail_state[key] = entry
+                states.append(entry[0])
+
+            parsed = self._parse_files([key for _, key, _ in misses], states)
+            for (slot, key, st), (state, closed, pending) in zip(misses, parsed):
+                done = self._tail_state[key][1]
+                done.extend(closed)
+                self._tail_state[key] = (state, done)
+                convos = done + pending
+                fingerprints = [prompt_fingerprint(c.prompt) for c in convos]
+                self._parse_cache[key] = (st.st_mtime_ns, st.st_size, convos, fingerprints)
+                per_file[slot] = (convos, fingerprints)
+
+        # Fingerprints come from the cache and ride along to the base dedup,
+        # so prompts of unchanged files are not rehashed on every poll.
+        results = FingerprintedConversations()
+        for convos, fingerprints in per_file:
+            for c, h in zip(convos, fingerprints):
+                if since and c.timestamp < since:
+                    continue
+                results.append(c)
+                results.fingerprints.append(h)
 
         logger.info("[session_jsonl] Found %d conversations from %d files",
-                     len(results), len(list(sessions_dir.rglob("*.jsonl"))))
+                     len(results), len(files))
         return results
 
-    def _parse_session_file(
-        self, path: Path, since: Optional[datetime]
-    ) -> list[RawConversation]:
-        results: list[RawConversation] = []
-
-        session_id = ""
-        session_cwd = ""
-        session_model = ""
-
-        user_messages: list[tuple[str, Optional[datetime]]] = []
-        assistant_responses: list[tuple[str, Optional[datetime]]] = []
-
-        current_user_msg = ""
-        current_assistant_resp = ""
-        current_ts: Optional[datetime] = None
+    @staticmethod
+    def _parse_files(
+        files: list[str], states: list[_RolloutState]
+    ) -> list[_ParseResult]:
+        """
+        Resume parsing each rollout from its state, in order. Decoding and text
+        extraction hold the GIL, so large batches fan out to the shared worker
+        processes; small ones (or single-core hosts) stay in-process where
+        pickling would dominate.
+        """
+        workers = min(os.cpu_count() or 1, len(files))
+        if workers > 1 and len(files) >= _PARALLEL_MIN_FILES:
+            chunksize = max(1, len(files) // (workers * 4))
+            pool = None
+            try:
+                pool = _parse_pool()
+                return list(pool.map(
+                    CodexAdapter._parse_session_file, files, states,
+                    chunksize=chunksize,
+                ))
+            # BrokenProcessPool, or a pool shut down under us, is a RuntimeError.
+            except (OSError, NotImplementedError, RuntimeError) as e:
+                logger.debug("Process pool unavailable, parsing serially: %s", e)
+                if pool is not None:
+                    _drop_parse_pool(pool)
+        return [CodexAdapter._parse_session_file(f, s) for f, s in zip(files, states)]
 
+    @staticmethod
+    def _parse_session_file(path: str, state: _RolloutState) -> _ParseResult:
+        """
+        Parse one rollout file from state.offset. Static so process-pool
+        workers can run it. Returns the state advanced past the last complete
+        line, the conversations closed by those lines, and the conversations a
+        full parse would add beyond that point (the unfinished last turn and
+        any partially written line), which are not carried into the state.
+        """
+        closed: list[RawConversation] = []
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        entry = json.loads(line)
-                    except json.JSONDecodeError:
-                        continue
-
-                    etype = entry.get("type", "")
-                    payload = entry.get("payload", {})
-                    ts_str = entry.get("timestamp", "")
-                    ts = self._parse_iso_timestamp(ts_str) if ts_str else None
-
-                    if etype == "session_meta":
-                        session_id = payload.get("id", "")
-                        session_cwd = payload.get("cwd", "")
-                        session_model = payload.get("model", "")
-
-                    elif etype == "event_msg":
-                        msg_type = payload.get("type", "")
-                        if msg_type == "user_message":
-                            if current_user_msg and current_assistant_resp:
-                                results.append(self._build_conversation(
-                                    current_user_msg, current_assistant_resp,
-                                    current_ts, session_cwd, session_model, since
-                                ))
-                                current_assistant_resp = ""
-
-                            current_user_msg = payload.get("message", "")
-                            current_ts = ts
-
-                    elif etype == "response_item":
-                        role = payload.get("role", "")
-                        content_blocks = payload.get("content", [])
-
-                        if role == "user":
-                            text = self._extract_text_from_blocks(content_blocks)
-                            if text and not text.startswith("<") and len(text) > 10:
-                                if not current_user_msg:
-                                    current_user_msg = text
-                                    current_ts = ts
-
-                        elif role == "assistant":
-                            text = self._extract_assistant_content(content_blocks)
-                            if text:
-                                current_assistant_resp += text + "\n"
-
-                        elif role == "developer":
-                            pass
-
+            CodexAdapter._consume_lines(
+                state, iter_lines(path, offset=state.offset, partial=False), closed
+            )
+            with open(path, "rb") as f:
+                f.seek(state.offset)
+                rest = f.read()
         except (OSError, UnicodeDecodeError) as e:
             logger.debug("Failed to read Codex session %s: %s", path, e)
+            rest = b""
+
+        pending_state = replace(state, assistant_parts=list(state.assistant_parts))
+        pending: list[RawConversation] = []
+        if rest:
+            CodexAdapter._consume_lines(pending_state, rest.split(b"\n"), pending)
+        last = CodexAdapter._build_conversation(
+            pending_state.user_msg, "".join(pending_state.assistant_parts), pending_state.ts,
+            pending_state.cwd, pending_state.model, None,
+        )
+        if last is not None:
+            pending.append(last)
+        return state, closed, pending
 
-        if current_user_msg and current_assistant_resp:
-            results.append(self._build_conversation(
-                current_user_msg, current_assistant_resp,
-                current_ts, session_cwd, session_model, since
-            ))
+    @staticmethod
+    def _consume_lines(
+        state: _RolloutState, lines: Iterable[bytes], closed: list[RawConversation]
+    ) -> None:
+        """
+        Feed rollout lines through the turn state in `state`, appending each
+        conversation closed by a new user message to `closed`.
+        """
+        session_cwd = state.cwd
+        session_model = state.model
+        current_user_msg = state.user_msg
+        assistant_parts = state.assistant_parts
+        current_ts = state.ts
+        offset = state.offset
+
+        # Bind the per-line helpers once rather than resolving them through
+        # the class on every line.
+        extract_user = CodexAdapter._extract_text_from_blocks
+        extract_assistant = CodexAdapter._extract_assistant_content
+        entry_timestamp = CodexAdapter._entry_timestamp
+        build = CodexAdapter._build_conversation
+        skip_line = _SKIP_LINE_RE.match
+        prescreen = not FAST_LOADS
 
-        return [r for r in results if r is not None]
+        try:
+            for line in lines:
+                offset += len(line) + 1
+                # Skip lines that cannot contribute (turn_context, token counts,
+                # reasoning, tool output) by their head when it has the usual
+                # layout, otherwise (without orjson) by a byte search.
+                if skip_line(line) is not None:
+                    continue
+                if prescreen and (b'"role"' not in line and b'"user_message"' not in line
+                                  and b'"session_meta"' not in line):
+                    continue
+                try:
+                    entry = loads(line)
+                except JSON_ERRORS:
+                    continue
+
+                etype = entry.get("type", "")
+                payload = entry.get("payload", {})
+
+                # Branches ordered by frequency; the timestamp is only parsed
+                # where a user turn starts, not for every line.
+                if etype == "response_item":
+                    role = payload.get("role", "")
+                    content_blocks = payload.get("content", [])
+
+                    if role == "assistant":
+                        text = extract_assistant(content_blocks)
+                        if text:
+                            assistant_parts.append(text)
+                            assistant_parts.append("\n")
+
+                    elif role == "user" and not current_user_msg:
+                        text = extract_user(content_blocks)
+                        if text and not text.startswith("<") and len(text) > 10:
+                            current_user_msg = text
+                            current_ts = entry_timestamp(entry)
+
+                elif etype == "event_msg":
+                    if payload.get("type", "") == "user_message":
+                        if current_user_msg and assistant_parts:
+                            convo = build(
+                                current_user_msg, "".join(assistant_parts),
+                                current_ts, session_cwd, session_model, None
+                            )
+                            if convo is not None:
+                                closed.append(convo)
+                            assistant_parts = []
+
+                        current_user_msg = payload.get("message", "")
+                        current_ts = entry_timestamp(entry)
+
+                elif etype == "session_meta":
+                    # Every conversation of the session holds these; interning
+                    # shares one copy across files and worker-pickled results.
+                    session_cwd = _intern(payload.get("cwd", ""))
+                    session_model = _intern(payload.get("model", ""))
+        finally:
+            state.cwd = session_cwd
+            state.model = session_model
+            state.user_msg = current_user_msg
+            state.assistant_parts = assistant_parts
+            state.ts = current_ts
+            state.offset = offset
 
+    @staticmethod
     def _build_conversation(
-        self,
         prompt: str,
         response: str,
         ts: Optional[datetime],
@@ -198,7 +408,7 @@ class CodexAdapter(BaseAdapter):
             return None
 
         project_path = cwd
-        project_name = Path(cwd).name if cwd else ""
+        project_name = _intern(os.path.basename(cwd.rstrip(os.sep))) if cwd else ""
 
         return RawConversation(
             timestamp=effective_ts,
@@ -219,13 +429,13 @@ class CodexAdapter(BaseAdapter):
         for block in blocks:
             if isinstance(block, dict):
                 btype = block.get("type", "")
-                if btype == "input_text":
-                    parts.append(block.get("text", ""))
-                elif btype == "text":
-                    parts.append(block.get("text", ""))
-            elif isinstance(block, str):
+                if btype == "input_text" or btype == "text":
+                    text = block.get("text")
+                    if text:
+                        parts.append(text)
+            elif isinstance(block, str) and block:
                 parts.append(block)
-        return "\n".join(p for p in parts if p)
+        return "\n".join(parts)
 
     @staticmethod
     def _extract_assistant_content(blocks) -> str:
@@ -235,34 +445,25 @@ class CodexAdapter(BaseAdapter):
         for block in blocks:
             if isinstance(block, dict):
                 btype = block.get("type", "")
-                if btype == "output_text":
-                    parts.append(block.get("text", ""))
-                elif btype == "text":
-                    parts.append(block.get("text", ""))
+                if btype == "output_text" or btype == "text":
+                    text = block.get("text")
+                    if text:
+                        parts.append(text)
                 elif btype == "tool_use":
                     name = block.get("name", "unknown")
                     parts.append(f"[Tool: {name}]")
-            elif isinstance(block, str):
+            elif isinstance(block, str) and block:
                 parts.append(block)
-        return "\n".join(p for p in parts if p)
+        return "\n".join(parts)
+
+    @staticmethod
+    def _entry_timestamp(entry: dict) -> Optional[datetime]:
+        ts_str = entry.get("timestamp", "")
+        return CodexAdapter._parse_iso_timestamp(ts_str) if ts_str else None
 
     @staticmethod
     def _parse_iso_timestamp(raw: str) -> Optional[datetime]:
         try:
-            dt = datetime.fromisoformat(raw.replace("Z", "+00:00"))
-            if dt.tzinfo is not None:
-                dt = dt.replace(tzinfo=None)
-            return dt
-        except (ValueError, AttributeError):
+            return parse_iso_datetime(raw)
+        except (ValueError, TypeError, AttributeError):
             return None
-
-    @staticmethod
-    def _deduplicate(conversations: list[RawConversation]) -> list[RawConversation]:
-        seen: set[str] = set()
-        unique: list[RawConversation] = []
-        for convo in conversations:
-            key = convo.prompt[:200].strip()
-            if key and key not in seen:
-                seen.add(key)
-                unique.append(convo)
-        return unique
@@ -40,21 +40,41 @@ coverage on every scan — no data source is ever silently skipped.
 
 from __future__ import annotations
 
-import json
+import functools
 import logging
+import os
 import platform
 import sqlite3
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
+from urllib.parse import unquote, urlparse
 
-from adapters.base import BaseAdapter, RawConversation, SniffLayer
+from adapters._io import iter_lines, map_threaded, scan_dir
+from adapters._json import JSON_ERRORS, loads
+from adapters._sqlite import connect_ro
+from adapters.base import BaseAdapter, RawConversation, SniffLayer, modified_before, parse_iso_datetime
 
 logger = logging.getLogger("openbbox.cursor")
 
+# Composer message roles, as spelled by the different Cursor storage versions.
+_USER_ROLES = frozenset(("user", "human"))
+_ASSISTANT_ROLES = frozenset(("assistant", "ai", "bot"))
+
+# Numeric timestamps above this are epoch milliseconds, below it seconds.
+_MS_EPOCH_THRESHOLD = 1_000_000_000_000
+
+# Workspace DB connections kept open between polls (least recently used are
+# closed first). Small on purpose: each holds an fd and an mmap, and users
+# with hundreds of workspaces must not run the process out of descriptors.
+CONN_CACHE_SIZE = 32
+
 
 # ── Path helpers (cross-platform) ──
 
+@functools.lru_cache(maxsize=None)
 def _cursor_global_storage() -> Path:
     system = platform.system()
     if system == "Darwin":
@@ -66,6 +86,7 @@ def _cursor_global_storage() -> Path:
     return Path.home() / ".cursor"
 
 
+@functools.lru_cache(maxsize=None)
 def _cursor_workspace_storage() -> Path:
     system = platform.system()
     if system == "Darwin":
@@ -77,12 +98,45 @@ def _cursor_workspace_storage() -> Path:
     return Path.home() / ".cursor" / "workspaceStorage"
 
 
+@functools.lru_cache(maxsize=None)
 def _cursor_projects_dir() -> Path:
     return Path.home() / ".cursor" / "projects"
 
 
+def _open_ro(db_path: str, check_same_thread: bool = True) -> tuple[sqlite3.Connection, bool, bool]:
+    """
+    Open a Cursor state DB read-only and probe its schema once.
+    Returns (conn, has ItemTable, has cursorDiskKV).
+    """
+    conn = connect_ro(db_path, check_same_thread)
+    try:
+        tables = {name for (name,) in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table'"
+        )}
+    except sqlite3.Error:
+        conn.close()
+        raise
+    return conn, "ItemTable" in tables, "cursorDiskKV" in tables
+
+
 class CursorAdapter(BaseAdapter):
 
+    def __init__(self) -> None:
+        # db path → (st_ino, read-only connection, has ItemTable), in LRU order
+        # and capped at CONN_CACHE_SIZE. Kept open across polls so a repeated
+        # scan skips connect, PRAGMAs and the schema probe, and finds SQLite's
+        # page cache already warm.
+        self._conn_cache: OrderedDict[str, tuple[int, sqlite3.Connection, bool]] = OrderedDict()
+        self._conn_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close the cached workspace DB connections."""
+        with self._conn_lock:
+            cached = list(self._conn_cache.values())
+            self._conn_cache.clear()
+        for _, conn, _ in cached:
+            conn.close()
+
     def name(self) -> str:
         return "Cursor"
 
@@ -146,30 +200,51 @@ class CursorAdapter(BaseAdapter):
             logger.info("[workspace_db] workspaceStorage not found at %s", ws_root)
             return results
 
-        scanned = 0
-        for ws_dir in ws_root.iterdir():
-            if not ws_dir.is_dir():
+        # (workspace dir, its state.vscdb) for every workspace with a DB
+        jobs: list[tuple[str, str]] = []
+        for ws_entry in scan_dir(ws_root):
+            if not ws_entry.is_dir():
                 continue
 
-            db_path = ws_dir / "state.vscdb"
-            if not db_path.exists():
+            db_path = os.path.join(ws_entry.path, "state.vscdb")
+            if not os.path.exists(db_path):
                 continue
+            jobs.append((ws_entry.path, db_path))
 
-            project_name, project_path = self._resolve_workspace_project(ws_dir)
-            scanned += 1
+        for convos in map_threaded(lambda job: self._scan_workspace(*job, since), jobs):
+            results.extend(convos)
 
-            convos = []
-            convos.extend(self._read_composer_data(str(db_path), since))
-            convos.extend(self._read_workspace_prompts(str(db_path), since))
+        # Release connections to workspaces that no longer exist.
+        live = {db_path for _, db_path in jobs}
+        with self._conn_lock:
+            gone = [self._conn_cache.pop(p) for p in list(self._conn_cache) if p not in live]
+        for _, conn, _ in gone:
+            conn.close()
 
-            for c in convos:
-                c.project_name = project_name
-                c.project_path = project_path
+        logger.info("[workspace_db] Scanned %d workspace(s), found %d conversation(s)", len(jobs), len(results))
+        return results
 
-            results.extend(convos)
+    def _scan_workspace(self, ws_dir: str, db_path: str, since: Optional[datetime]) -> list[RawConversation]:
+        project_name, project_path = self._resolve_workspace_project(Path(ws_dir))
 
-        logger.info("[workspace_db] Scanned %d workspace(s), found %d conversation(s)", scanned, len(results))
-        return results
+        # Both readers share one connection and one schema probe.
+        try:
+            ino, conn, has_items = self._checkout_conn(db_path)
+        except (OSError, sqlite3.OperationalError, sqlite3.DatabaseError) as e:
+            logger.debug("Failed to open workspace DB %s: %s", db_path, e)
+            return []
+        try:
+            if not has_items:
+                return []
+            convos = self._read_composer_data(conn, db_path, since)
+            convos.extend(self._read_workspace_prompts(conn, db_path, since))
+        finally:
+            self._checkin_conn(db_path, ino, conn, has_items)
+
+        for c in convos:
+            c.project_name = project_name
+            c.project_path = project_path
+        return convos
 
     # ── Layer 2: Agent Transcripts ──
 
@@ -185,99 +260,134 @@ class CursorAdapter(BaseAdapter):
             return results
 
         scanned_dirs = 0
-        scanned_files = 0
+        # (transcript file, project_name, project_path) for every transcript
+        jobs: list[tuple[str, str, str]] = []
 
-        for project_dir in projects_dir.iterdir():
-            if not project_dir.is_dir():
+        for project_entry in scan_dir(projects_dir):
+            if not project_entry.is_dir():
                 continue
 
-            transcripts_dir = project_dir / "agent-transcripts"
-            if not transcripts_dir.exists():
+            transcripts_dir = os.path.join(project_entry.path, "agent-transcripts")
+            if not os.path.exists(transcripts_dir):
                 continue
 
             scanned_dirs += 1
-            project_path = self._decode_project_path(project_dir.name)
-            project_name = Path(project_path).name if project_path else project_dir.name
+            project_path = self._decode_project_path(project_entry.name)
+            project_name = Path(project_path).name if project_path else project_entry.name
 
             try:
-                for entry in transcripts_dir.iterdir():
-                    if entry.suffix == ".jsonl":
-                        scanned_files += 1
-                        self._process_transcript(entry, since, project_name, project_path, results)
+                with os.scandir(transcripts_dir) as it:
+                    entries = list(it)
+                for entry in entries:
+                    if entry.name.endswith(".jsonl"):
+                        jobs.append((entry.path, project_name, project_path))
                     elif entry.is_dir():
-                        for jsonl_file in entry.iterdir():
-                            if jsonl_file.suffix == ".jsonl":
-                                scanned_files += 1
-                                self._process_transcript(jsonl_file, since, project_name, project_path, results)
+                        with os.scandir(entry.path) as sub:
+                            sub_entries = list(sub)
+                        for jsonl_entry in sub_entries:
+                            if jsonl_entry.name.endswith(".jsonl"):
+                                jobs.append((jsonl_entry.path, project_name, project_path))
             except OSError as e:
                 logger.debug("[agent_transcripts] Error scanning %s: %s", transcripts_dir, e)
 
+        for convos in map_threaded(lambda job: self._process_transcript(job[0], since, job[1], job[2]), jobs):
+            results.extend(convos)
+
         logger.info(
             "[agent_transcripts] Scanned %d project dir(s), %d JSONL file(s), found %d conversation(s)",
-            scanned_dirs, scanned_files, len(results),
+            scanned_dirs, len(jobs), len(results),
         )
         return results
 
-    def poll_with_progress(self, since=None, on_progress=None):
-        """Run the standard two-layer strategy, then deduplicate with our own method."""
-        result = super().poll_with_progress(since=since, on_progress=on_progress)
-        return self._deduplicate(result)
-
     # ── Workspace helpers ──
 
+    def _checkout_conn(self, db_path: str) -> tuple[int, sqlite3.Connection, bool]:
+        """
+        Take the cached connection for `db_path` out of the cache, or open one.
+        Checked-out connections are used by one thread at a time; a DB file
+        replaced since it was cached (new inode) gets a fresh connection.
+        """
+        ino = os.stat(db_path).st_ino
+        with self._conn_lock:
+            cached = self._conn_cache.pop(db_path, None)
+        if cached is not None:
+            if cached[0] == ino:
+                return cached
+            cached[1].close()
+        conn, has_items, _ = _open_ro(db_path, check_same_thread=False)
+        return ino, conn, has_items
+
+    def _checkin_conn(self, db_path: str, ino: int, conn: sqlite3.Connection, has_items: bool) -> None:
+        """
+        Return a checked-out connection to the cache as most recently used,
+        closing it if another thread won the slot and closing whatever falls
+        off the LRU end.
+        """
+        evicted: list[sqlite3.Connection] = []
+        with self._conn_lock:
+            if db_path in self._conn_cache:
+                evicted.append(conn)
+            else:
+                self._conn_cache[db_path] = (ino, conn, has_items)
+                while len(self._conn_cache) > CONN_CACHE_SIZE:
+                    evicted.append(self._conn_cache.popitem(last=False)[1][1])
+        for stale in evicted:
+            stale.close()
+
     @staticmethod
     def _resolve_workspace_project(ws_dir: Path) -> tuple[str, str]:
         """Extract project name and path from workspace.json."""
-        workspace_json = ws_dir / "workspace.json"
-        if workspace_json.exists():
-            try:
-                with open(workspace_json, "r") as f:
-                    ws_data = json.load(f)
-                folder_uri = ws_data.get("folder", "")
-                if folder_uri.startswith("file:///"):
-                    project_path = folder_uri[7:]
+        # Just try the open: a missing file is one failed syscall, not stat + open.
+        try:
+            with open(ws_dir / "workspace.json", "rb") as f:
+                ws_data = loads(f.read())
+            uri = urlparse(ws_data.get("folder", ""))
+            if uri.scheme == "file" and not uri.netloc:
+                # file:///home/me/my%20app → /home/me/my app;
+                # file:///c%3A/src/app → c:/src/app on Windows.
+                project_path = unquote(uri.path)
+                if os.name == "nt" and project_path.startswith("/"):
+                    project_path = project_path[1:]
+                if project_path:
                     return Path(project_path).name, project_path
-            except (json.JSONDecodeError, OSError):
-                pass
+        except (*JSON_ERRORS, OSError, AttributeError, TypeError, ValueError):
+            pass
         return ws_dir.name, ""
 
     # ── Data readers ──
 
-    def _read_workspace_prompts(self, db_path: str, since: Optional[datetime]) -> list[RawConversation]:
-        """Read aiService.prompts — Chat mode conversations."""
+    def _read_workspace_prompts(
+        self, conn: sqlite3.Connection, db_path: str, since: Optional[datetime],
+    ) -> list[RawConversation]:
+        """Read aiService.prompts — Chat mode conversations. `conn` must have an ItemTable."""
         results: list[RawConversation] = []
         try:
-            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-            conn.row_factory = sqlite3.Row
-
-            tables = {r[0] for r in conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table'"
-            ).fetchall()}
-
-            if "ItemTable" not in tables:
-                conn.close()
-                return results
-
+            # Hand the value to the JSON decoder as raw UTF-8 rather than
+            # having sqlite3 decode it into a str first.
+            conn.text_factory = bytes
             row = conn.execute(
                 "SELECT value FROM ItemTable WHERE key='aiService.prompts'"
             ).fetchone()
 
-            if row and row["value"] and isinstance(row["value"], str) and len(row["value"]) > 10:
+            value = row[0] if row else None
+            if value and isinstance(value, bytes):
                 try:
-                    data = json.loads(row["value"])
+                    data = loads(value)
                     if isinstance(data, list):
+                        # One clock read serves every entry without a timestamp.
+                        scan_now = datetime.utcnow()
                         for entry in data:
                             if not isinstance(entry, dict):
                                 continue
-                            prompt = entry.get("prompt", entry.get("text", entry.get("message", "")))
-                            response = entry.get("response", entry.get("answer", entry.get("result", "")))
+                            prompt = entry.get("prompt") or entry.get("text") or entry.get("message")
+                            response = entry.get("response") or entry.get("answer") or entry.get("result")
                             if not prompt or not isinstance(prompt, str):
                                 continue
                             if not response:
                                 response = "(no response recorded)"
 
-                            ts = datetime.utcnow()
-                            raw_ts = entry.get("timestamp", entry.get("createdAt", entry.get("time")))
+                            ts = scan_now
+                            raw_ts = entry.get("timestamp") or entry.get("createdAt") or entry.get("time")
                             if raw_ts:
                                 ts = self._parse_generic_timestamp(raw_ts) or ts
 
@@ -288,46 +398,37 @@ class CursorAdapter(BaseAdapter):
                                 timestamp=ts,
                                 prompt=str(prompt).strip(),
                                 response=str(response).strip()[:2000],
-                                model_name=str(entry.get("model", entry.get("modelName", ""))),
+                                model_name=str(entry.get("model") or entry.get("modelName") or ""),
                             ))
-                except (json.JSONDecodeError, TypeError):
+                except (*JSON_ERRORS, TypeError):
                     pass
-
-            conn.close()
         except (sqlite3.OperationalError, sqlite3.DatabaseError) as e:
             logger.debug("Failed to read prompts from %s: %s", db_path, e)
         return results
 
-    def _read_composer_data(self, db_path: str, since: Optional[datetime]) -> list[RawConversation]:
-        """Read composer.composerData — Composer mode conversations."""
+    def _read_composer_data(
+        self, conn: sqlite3.Connection, db_path: str, since: Optional[datetime],
+    ) -> list[RawConversation]:
+        """Read composer.composerData — Composer mode conversations. `conn` must have an ItemTable."""
         results: list[RawConversation] = []
         try:
-            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-            conn.row_factory = sqlite3.Row
-
-            tables = {r[0] for r in conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table'"
-            ).fetchall()}
-
-            if "ItemTable" not in tables:
-                conn.close()
-                return results
-
-            rows = conn.execute("SELECT key, value FROM ItemTable").fetchall()
-            for row in rows:
-                key = row["key"]
-                value = row["value"]
-                if not value or not isinstance(value, str):
+            # The key filter runs in SQLite, so the many unrelated settings rows
+            # never cross into Python. LIKE is ASCII case-insensitive. Values
+            # come back as raw bytes, which the JSON decoder takes directly.
+            conn.text_factory = bytes
+            rows = conn.execute(
+                "SELECT value FROM ItemTable "
+                "WHERE key = 'composer.composerData' OR key LIKE '%chat%'"
+            )
+            for (value,) in rows:
+                if not value or not isinstance(value, bytes):
                     continue
 
-                if key in ("composer.composerData",) or "chat" in key.lower():
-                    try:
-                        data = json.loads(value)
-                        results.extend(self._parse_composer_json(data, since))
-                    except (json.JSONDecodeError, TypeError):
-                        continue
-
-            conn.close()
+                try:
+                    data = loads(value)
+                    results.extend(self._parse_composer_json(data, since))
+                except (*JSON_ERRORS, TypeError):
+                    continue
         except (sqlite3.OperationalError, sqlite3.DatabaseError) as e:
             logger.debug("Failed to read Cursor ItemTable from %s: %s", db_path, e)
         return results
@@ -337,7 +438,7 @@ class CursorAdapter(BaseAdapter):
 
         composers = []
         if isinstance(data, dict):
-            composers = data.get("allComposers", data.get("composers", []))
+            composers = data.get("allComposers") or data.get("composers") or []
             if not composers:
                 for key in ("messages", "tabs", "conversations", "history"):
                     if key in data and isinstance(data[key], list):
@@ -346,46 +447,52 @@ class CursorAdapter(BaseAdapter):
         elif isinstance(data, list):
             composers = data
 
+        # Default timestamp shared by every composer that carries none.
+        scan_now = datetime.utcnow()
         for composer in composers:
             if not isinstance(composer, dict):
                 continue
-            messages = composer.get("messages", composer.get("conversation", []))
+            messages = composer.get("messages") or composer.get("conversation")
             if not isinstance(messages, list):
                 continue
 
             prompt_buf = ""
-            response_buf = ""
-            ts = datetime.utcnow()
+            response_parts: list[str] = []
+            ts = scan_now
 
             for msg in messages:
                 if not isinstance(msg, dict):
                     continue
-                role = msg.get("role", msg.get("type", ""))
-                content = msg.get("content", msg.get("text", msg.get("message", "")))
+                # `or` chains stop at the first populated key; nested .get()
+                # defaults would evaluate every fallback lookup up front.
+                role = msg.get("role") or msg.get("type")
+                if not isinstance(role, str):
+                    continue
+                content = msg.get("content") or msg.get("text") or msg.get("message")
                 if not content or not isinstance(content, str):
                     continue
 
-                msg_ts = self._parse_generic_timestamp(
-                    msg.get("timestamp", msg.get("createdAt", msg.get("time")))
-                )
-
-                if role in ("user", "human"):
-                    if prompt_buf and response_buf:
+                if role in _USER_ROLES:
+                    if prompt_buf and response_parts:
                         if not since or ts >= since:
                             results.append(RawConversation(
-                                timestamp=ts, prompt=prompt_buf, response=response_buf
+                                timestamp=ts, prompt=prompt_buf, response="".join(response_parts)
                             ))
                     prompt_buf = content
-                    response_buf = ""
+                    response_parts = []
+                    # Only user turns carry the conversation's timestamp.
+                    msg_ts = self._parse_generic_timestamp(
+                        msg.get("timestamp") or msg.get("createdAt") or msg.get("time")
+                    )
                     if msg_ts:
                         ts = msg_ts
-                elif role in ("assistant", "ai", "bot"):
-                    response_buf += content
+                elif role in _ASSISTANT_ROLES:
+                    response_parts.append(content)
 
-            if prompt_buf and response_buf:
+            if prompt_buf and response_parts:
                 if not since or ts >= since:
                     results.append(RawConversation(
-                        timestamp=ts, prompt=prompt_buf, response=response_buf
+                        timestamp=ts, prompt=prompt_buf, response="".join(response_parts)
                     ))
 
         return results
@@ -401,25 +508,17 @@ class CursorAdapter(BaseAdapter):
         """
         results: list[RawConversation] = []
         try:
-            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-            conn.row_factory = sqlite3.Row
-
-            tables = {r[0] for r in conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table'"
-            ).fetchall()}
-
-            if "cursorDiskKV" not in tables:
+            conn, _, has_kv = _open_ro(db_path)
+            if not has_kv:
                 conn.close()
                 return results
 
             rows = conn.execute(
                 "SELECT key, value FROM cursorDiskKV WHERE key LIKE 'bubbleId:%' ORDER BY key"
-            ).fetchall()
+            )
 
             conversations_map: dict[str, list[dict]] = {}
-            for row in rows:
-                key = row["key"]
-                value = row["value"]
+            for key, value in rows:
                 if not value:
                     continue
                 parts = key.split(":")
@@ -427,9 +526,9 @@ class CursorAdapter(BaseAdapter):
                     continue
                 conv_id = parts[1]
                 try:
-                    bubble = json.loads(value)
+                    bubble = loads(value)
                     conversations_map.setdefault(conv_id, []).append(bubble)
-                except (json.JSONDecodeError, TypeError):
+                except (*JSON_ERRORS, TypeError):
                     continue
 
             for conv_id, bubbles in conversations_map.items():
@@ -442,9 +541,10 @@ class CursorAdapter(BaseAdapter):
 
     def _bubbles_to_conversations(self, bubbles: list[dict], since: Optional[datetime]) -> list[RawConversation]:
         results: list[RawConversation] = []
+        scan_now = datetime.utcnow()
         for bubble in bubbles:
             ts = self._parse_generic_timestamp(
-                bubble.get("createdAt", bubble.get("timestamp", bubble.get("time")))
+                bubble.get("createdAt") or bubble.get("timestamp") or bubble.get("time")
             )
             if since and ts and ts < since:
                 continue
@@ -453,16 +553,16 @@ class CursorAdapter(BaseAdapter):
             response = ""
             context_files: list[str] = []
 
-            msg_type = bubble.get("type", bubble.get("role", ""))
+            msg_type = bubble.get("type") or bubble.get("role")
             if msg_type in ("user", "human"):
                 prompt = self._extract_text(bubble)
             elif msg_type in ("assistant", "ai"):
                 response = self._extract_text(bubble)
 
             if not prompt:
-                prompt = bubble.get("userMessage", bubble.get("query", ""))
+                prompt = bubble.get("userMessage") or bubble.get("query") or ""
             if not response:
-                response = bubble.get("assistantMessage", bubble.get("answer", ""))
+                response = bubble.get("assistantMessage") or bubble.get("answer") or ""
 
             if "suggestedCodeBlocks" in bubble:
                 for block in (bubble["suggestedCodeBlocks"] or []):
@@ -478,11 +578,11 @@ class CursorAdapter(BaseAdapter):
                     if isinstance(chunk, dict) and "filePath" in chunk:
                         context_files.append(chunk["filePath"])
 
-            model_name = bubble.get("modelName", bubble.get("model", ""))
+            model_name = bubble.get("modelName") or bubble.get("model") or ""
 
             if prompt and response:
                 results.append(RawConversation(
-                    timestamp=ts or datetime.utcnow(),
+                    timestamp=ts or scan_now,
                     prompt=prompt.strip(),
                     response=response.strip(),
                     model_name=str(model_name),
@@ -492,74 +592,81 @@ class CursorAdapter(BaseAdapter):
 
     # ── Transcript helpers ──
 
-    def _process_transcript(self, jsonl_file, since, project_name, project_path, results):
+    def _process_transcript(self, jsonl_file: str, since, project_name, project_path) -> list[RawConversation]:
         try:
-            convos = self._parse_transcript_jsonl(jsonl_file, since)
-            for c in convos:
-                c.project_name = project_name
-                c.project_path = project_path
-            results.extend(convos)
+            convos = self._parse_transcript_jsonl(Path(jsonl_file), since)
         except (OSError, UnicodeDecodeError) as e:
             logger.debug("Failed to read transcript %s: %s", jsonl_file, e)
+            return []
+        for c in convos:
+            c.project_name = project_name
+            c.project_path = project_path
+        return convos
 
     def _parse_transcript_jsonl(self, path: Path, since: Optional[datetime]) -> list[RawConversation]:
         results: list[RawConversation] = []
         prompt_buf = ""
-        response_buf = ""
+        response_parts: list[str] = []
 
         try:
-            file_mtime = datetime.fromtimestamp(path.stat().st_mtime)
+            mtime = path.stat().st_mtime
         except OSError:
             file_mtime = datetime.utcnow()
+        else:
+            # Every turn is stamped with the file mtime, so a stale file is
+            # skipped on that same stat, before it is opened.
+            if modified_before(mtime, since):
+                return results
+            file_mtime = datetime.fromtimestamp(mtime)
 
         ts = file_mtime
 
-        with open(path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    entry = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-
-                role = entry.get("role", "")
-                message = entry.get("message", {})
-                content_blocks = message.get("content", []) if isinstance(message, dict) else []
-
-                text_parts: list[str] = []
-                for block in content_blocks:
-                    if isinstance(block, dict):
-                        if block.get("type") == "text":
-                            text_parts.append(block.get("text", ""))
-                        elif block.get("type") == "tool_use":
-                            text_parts.append(f"[Tool: {block.get('name', '')}]")
-                    elif isinstance(block, str):
-                        text_parts.append(block)
-
-                content = "\n".join(text_parts)
-                if not content:
-                    continue
+        # One read and a C-level split; both decoders skip surrounding whitespace.
+        for line in iter_lines(path):
+            if not line:
+                continue
+            try:
+                entry = loads(line)
+            except JSON_ERRORS:
+                continue
 
-                if role == "user":
-                    if prompt_buf and response_buf:
-                        if not since or ts >= since:
-                            results.append(RawConversation(
-                                timestamp=ts, prompt=prompt_buf,
-                                response=response_buf, session_id=path.stem,
-                            ))
-                    prompt_buf = content
-                    response_buf = ""
-                    ts = file_mtime
-                elif role == "assistant":
-                    response_buf += content + "\n"
+            role = entry.get("role", "")
+            message = entry.get("message", {})
+            content_blocks = message.get("content", []) if isinstance(message, dict) else []
+
+            text_parts: list[str] = []
+            for block in content_blocks:
+                if isinstance(block, dict):
+                    if block.get("type") == "text":
+                        text_parts.append(block.get("text", ""))
+                    elif block.get("type") == "tool_use":
+                        text_parts.append(f"[Tool: {block.get('name', '')}]")
+                elif isinstance(block, str):
+                    text_parts.append(block)
+
+            content = "\n".join(text_parts)
+            if not content:
+                continue
 
-        if prompt_buf and response_buf:
+            if role == "user":
+                if prompt_buf and response_parts:
+                    if not since or ts >= since:
+                        results.append(RawConversation(
+                            timestamp=ts, prompt=prompt_buf,
+                            response="".join(response_parts), session_id=path.stem,
+                        ))
+                prompt_buf = content
+                response_parts = []
+                ts = file_mtime
+            elif role == "assistant":
+                response_parts.append(content)
+                response_parts.append("\n")
+
+        if prompt_buf and response_parts:
             if not since or ts >= since:
                 results.append(RawConversation(
                     timestamp=ts, prompt=prompt_buf,
-                    response=response_buf.strip(), session_id=path.stem,
+                    response="".join(response_parts).strip(), session_id=path.stem,
                 ))
 
         return results
@@ -574,7 +681,7 @@ class CursorAdapter(BaseAdapter):
 
     @staticmethod
     def _extract_text(bubble: dict) -> str:
-        text = bubble.get("text", bubble.get("content", bubble.get("message", "")))
+        text = bubble.get("text") or bubble.get("content") or bubble.get("message")
         if isinstance(text, list):
             return "\n".join(
                 b.get("text", "") if isinstance(b, dict) else str(b) for b in text
@@ -587,21 +694,7 @@ class CursorAdapter(BaseAdapter):
             return None
         try:
             if isinstance(raw, (int, float)):
-                return datetime.fromtimestamp(raw / 1000 if raw > 1e12 else raw)
-            dt = datetime.fromisoformat(str(raw).replace("Z", "+00:00"))
-            if dt.tzinfo is not None:
-                dt = dt.replace(tzinfo=None)
-            return dt
-        except (ValueError, OSError, TypeError):
+                return datetime.fromtimestamp(raw / 1000 if raw > _MS_EPOCH_THRESHOLD else raw)
+            return parse_iso_datetime(str(raw))
+        except (ValueError, OSError, TypeError, OverflowError):
             return None
-
-    @staticmethod
-    def _deduplicate(conversations: list[RawConversation]) -> list[RawConversation]:
-        seen: set[str] = set()
-        unique: list[RawConversation] = []
-        for convo in conversations:
-            key = convo.prompt[:200].strip()
-            if key and key not in seen:
-                seen.add(key)
-                unique.append(convo)
-        return unique
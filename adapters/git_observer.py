@@ -7,13 +7,24 @@ Handles empty repos, encoding issues, and provides combined staged+unstaged diff
 
 from __future__ import annotations
 
+import fnmatch
 import logging
 import os
-from datetime import datetime
+import re
+import subprocess
+import threading
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Callable, Optional
 
-from watchdog.events import FileSystemEvent, FileSystemEventHandler
+from watchdog.events import (
+    FileCreatedEvent,
+    FileDeletedEvent,
+    FileModifiedEvent,
+    FileSystemEvent,
+    FileSystemEventHandler,
+)
 from watchdog.observers import Observer
 
 from core.models import FileDiff
@@ -54,10 +65,45 @@ IGNORE_PATTERNS = {
 }
 
 
+def _compile_ignore(patterns) -> re.Pattern:
+    """
+    One regex for all ignore patterns, so an event path is scanned once.
+    Plain names match anywhere in the path; "*.ext" globs match the suffix.
+    """
+    parts = []
+    for pattern in sorted(patterns):
+        if pattern.startswith("*") and not any(c in pattern[1:] for c in "*?["):
+            parts.append(re.escape(pattern[1:]) + r"\Z")
+        elif any(c in pattern for c in "*?["):
+            parts.append(fnmatch.translate(pattern))
+        else:
+            parts.append(re.escape(pattern))
+    return re.compile("|".join(parts))
+
+
+_IGNORE_RE = _compile_ignore(IGNORE_PATTERNS)
+
+# Quiet period before RepoFileHandler hands a burst of events to its callback.
+DEBOUNCE_SECONDS = 0.15
+
+# (earlier change, later change) → the one change reported for the burst;
+# None means the file is back where it started and nothing is reported.
+_COALESCE = {
+    ("added", "modified"): "added",
+    ("added", "deleted"): None,
+    ("deleted", "added"): "modified",
+    ("deleted", "modified"): "modified",
+}
+
+# The watchdog event types RepoFileHandler handles; everything else is
+# filtered out at the observer (and, with inotify, in the kernel).
+WATCHED_EVENTS = [FileCreatedEvent, FileModifiedEvent, FileDeletedEvent]
+
+
 class GitDiffCapture:
     """
     Captures git diffs from a local repository.
-    Uses repo.git.diff() API (Aider pattern) for reliability with empty repos.
+    Runs `git diff` directly (Aider's commands) for reliability with empty repos.
     """
 
     def __init__(self, repo_path: str, encoding: str = "utf-8"):
@@ -75,25 +121,49 @@ class GitDiffCapture:
             )
         return self._repo
 
+    def _git(self, *args: str) -> str:
+        """
+        Run a git command in the work tree and return its decoded stdout.
+        Spawned with subprocess directly: GitPython's command wrapper adds
+        per-call overhead on top of the fork that dominates small diffs.
+        Raises GitCommandError on a non-zero exit, like repo.git.* did.
+        """
+        cmd = ["git", *args]
+        proc = subprocess.run(
+            cmd,
+            cwd=self.repo.working_tree_dir,
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+        )
+        if proc.returncode != 0:
+            raise git.exc.GitCommandError(cmd, proc.returncode, proc.stderr)
+        return proc.stdout.decode(self.encoding, errors="replace")
+
     def _has_commits(self) -> bool:
-        """Check if the current branch has any commits (handles empty repos)."""
+        """Check if HEAD resolves to a commit (handles empty repos)."""
         try:
-            active_branch = self.repo.active_branch
-            return any(self.repo.iter_commits(active_branch))
+            # Resolved from the refs and object DB in-process; walking the
+            # branch with iter_commits() forked a `git rev-list` per call.
+            return self.repo.head.is_valid()
         except (TypeError, *GIT_ERRORS):
             return False
 
     def get_dirty_files(self) -> list[str]:
-        """Get all dirty files (staged + unstaged), Aider-style."""
+        """Get all dirty files (staged + unstaged + untracked), Aider-style."""
         try:
+            # One `git status` covers what used to take two diffs and an
+            # untracked-files listing. -z keeps paths unquoted.
+            out = self._git("status", "--porcelain", "-z", "--untracked-files=all")
             dirty = set()
-            staged = self.repo.git.diff("--name-only", "--cached").splitlines()
-            dirty.update(f for f in staged if f.strip())
-            unstaged = self.repo.git.diff("--name-only").splitlines()
-            dirty.update(f for f in unstaged if f.strip())
-            # Untracked files
-            untracked = self.repo.untracked_files
-            dirty.update(untracked)
+            fields = iter(out.split("\0"))
+            for entry in fields:
+                if len(entry) < 4:
+                    continue
+                dirty.add(entry[3:])
+                if entry[0] in "RC":
+                    # Renames and copies are followed by their source path.
+                    next(fields, None)
             return sorted(dirty)
         except GIT_ERRORS as e:
             logger.debug("Failed to get dirty files: %s", e)
@@ -110,20 +180,14 @@ class GitDiffCapture:
 
             if self._has_commits():
                 args = ["HEAD", "--"] + fnames if fnames else ["HEAD"]
-                raw_diff = self.repo.git.diff(
-                    *args, stdout_as_string=False
-                ).decode(self.encoding, errors="replace")
+                raw_diff = self._git("diff", *args)
             else:
                 # Empty repo: get staged and unstaged separately
                 cached_args = ["--cached", "--"] + fnames if fnames else ["--cached"]
                 wd_args = ["--"] + fnames if fnames else []
 
-                staged = self.repo.git.diff(
-                    *cached_args, stdout_as_string=False
-                ).decode(self.encoding, errors="replace")
-                unstaged = self.repo.git.diff(
-                    *wd_args, stdout_as_string=False
-                ).decode(self.encoding, errors="replace") if wd_args else ""
+                staged = self._git("diff", *cached_args)
+                unstaged = self._git("diff", *wd_args) if wd_args else ""
                 raw_diff = staged + "\n" + unstaged
 
             return self._parse_unified_diff(raw_diff)
@@ -134,9 +198,7 @@ class GitDiffCapture:
     def get_unstaged_diff(self) -> list[FileDiff]:
         """Get unstaged diffs (working tree vs index)."""
         try:
-            raw = self.repo.git.diff(stdout_as_string=False).decode(
-                self.encoding, errors="replace"
-            )
+            raw = self._git("diff")
             return self._parse_unified_diff(raw)
         except GIT_ERRORS as e:
             logger.debug("Failed to get unstaged diff: %s", e)
@@ -145,25 +207,37 @@ class GitDiffCapture:
     def get_staged_diff(self) -> list[FileDiff]:
         """Get staged diffs (index vs HEAD)."""
         try:
-            raw = self.repo.git.diff(
-                "--cached", stdout_as_string=False
-            ).decode(self.encoding, errors="replace")
+            raw = self._git("diff", "--cached")
             return self._parse_unified_diff(raw)
         except GIT_ERRORS as e:
             logger.debug("Failed to get staged diff: %s", e)
             return []
 
     def get_recent_commits(self, count: int = 5) -> list[dict]:
-        """Get recent commit info for context."""
+        """
+        Get recent commit info for context.
+        One `git log --name-only` call covers every commit instead of having
+        GitPython compute full numstat line counts per commit just to len()
+        them. Merge commits print no file list there, so only those take an
+        extra diff against their first parent (what commit.stats used).
+        """
         commits = []
         try:
-            for commit in self.repo.iter_commits(max_count=count):
+            raw = self._git(
+                "log", f"-n{count}", "--no-renames", "--name-only",
+                "--format=%x1e%H%x1f%P%x1f%an%x1f%ct%x1f%B%x1f",
+            )
+            for record in raw.split("\x1e")[1:]:
+                sha, parents, author, committed, message, names = record.split("\x1f", 5)
+                parents = parents.split()
+                if len(parents) > 1:
+                    names = self._git("diff", "--no-renames", "--name-only", parents[0], sha, "--")
                 commits.append({
-                    "hash": commit.hexsha[:8],
-                    "message": commit.message.strip(),
-                    "author": str(commit.author),
-                    "timestamp": datetime.fromtimestamp(commit.committed_date).isoformat(),
-                    "files_changed": len(commit.stats.files),
+                    "hash": sha[:8],
+                    "message": message.strip(),
+                    "author": author,
+                    "timestamp": datetime.fromtimestamp(int(committed)).isoformat(),
+                    "files_changed": sum(1 for name in names.splitlines() if name),
                 })
         except GIT_ERRORS:
             pass
@@ -172,42 +246,62 @@ class GitDiffCapture:
     @staticmethod
     def _parse_unified_diff(raw_diff: str) -> list[FileDiff]:
         """Parse raw unified diff output into structured FileDiff objects."""
-        if not raw_diff.strip():
+        if not raw_diff or raw_diff.isspace():
             return []
 
+        # Walks raw_diff by offset instead of splitting it into a list of lines:
+        # consecutive hunk lines form a run, taken as one slice of raw_diff when
+        # it ends, so a file's hunk is usually a single slice.
         results: list[FileDiff] = []
         current_file = ""
-        current_hunk_lines: list[str] = []
+        runs: list[str] = []
+        run_start = -1
         change_type = "modified"
-
-        for line in raw_diff.split("\n"):
-            if line.startswith("diff --git"):
+        size = len(raw_diff)
+        pos = 0
+
+        while pos <= size:
+            end = raw_diff.find("\n", pos)
+            if end < 0:
+                end = size
+            first = raw_diff[pos:pos + 1]
+            if current_file and first and (first in "+- " or raw_diff.startswith("@@", pos)):
+                if run_start < 0:
+                    run_start = pos
+                pos = end + 1
+                continue
+
+            if run_start >= 0:
+                runs.append(raw_diff[run_start:pos - 1])
+                run_start = -1
+            if raw_diff.startswith("diff --git", pos):
                 # Save previous file's diff
-                if current_file and current_hunk_lines:
+                if current_file and runs:
                     results.append(FileDiff(
                         file_path=current_file,
-                        hunk="\n".join(current_hunk_lines),
+                        hunk="\n".join(runs),
                         change_type=change_type,
                     ))
                 # Parse new file path from "diff --git a/path b/path"
-                parts = line.split(" b/", 1)
+                parts = raw_diff[pos:end].split(" b/", 1)
                 current_file = parts[1] if len(parts) > 1 else ""
-                current_hunk_lines = []
+                runs = []
                 change_type = "modified"
-            elif line.startswith("new file"):
+            elif raw_diff.startswith("new file", pos):
                 change_type = "added"
-            elif line.startswith("deleted file"):
+            elif raw_diff.startswith("deleted file", pos):
                 change_type = "deleted"
-            elif line.startswith("rename"):
+            elif raw_diff.startswith("rename", pos):
                 change_type = "renamed"
-            elif line.startswith(("@@", "+", "-", " ")) and current_file:
-                current_hunk_lines.append(line)
+            pos = end + 1
 
         # Don't forget the last file
-        if current_file and current_hunk_lines:
+        if run_start >= 0:
+            runs.append(raw_diff[run_start:size])
+        if current_file and runs:
             results.append(FileDiff(
                 file_path=current_file,
-                hunk="\n".join(current_hunk_lines),
+                hunk="\n".join(runs),
                 change_type=change_type,
             ))
 
@@ -227,44 +321,99 @@ class FileChangeEvent:
 
 
 class RepoFileHandler(FileSystemEventHandler):
-    """Watches for file changes in a repo, with smart filtering."""
+    """
+    Watches for file changes in a repo, with smart filtering.
 
-    def __init__(self, callback: Callable[[FileChangeEvent], None]):
+    Editors fire several events per save, so events are held until the repo
+    has been quiet for `debounce` seconds and then delivered once per path,
+    merged into a single change type. debounce=0 delivers every event as-is.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[FileChangeEvent], None],
+        debounce: float = DEBOUNCE_SECONDS,
+    ):
         super().__init__()
         self.callback = callback
+        self.debounce = debounce
+        self._lock = threading.Lock()
+        # path → (merged change type, monotonic time of the latest event);
+        # turned into a datetime only once per delivered path, at flush.
+        self._pending: dict[str, tuple[str, float]] = {}
+        self._last_event = 0.0
+        self._timer: Optional[threading.Timer] = None
+
+    def _enqueue(self, path: str, change_type: str) -> None:
+        if self.debounce <= 0:
+            self.callback(FileChangeEvent(file_path=path, change_type=change_type, timestamp=datetime.utcnow()))
+            return
+        now = time.monotonic()
+        with self._lock:
+            prev = self._pending.get(path)
+            if prev is not None:
+                change_type = _COALESCE.get((prev[0], change_type), change_type)
+            if change_type is not None:
+                # Assigning to an existing key keeps its first-seen position.
+                self._pending[path] = (change_type, now)
+            elif prev is not None:
+                del self._pending[path]
+            self._last_event = now
+            # One timer per burst: it re-arms itself until events stop arriving.
+            if self._timer is None:
+                self._start_timer(self.debounce)
+
+    def _start_timer(self, delay: float) -> None:
+        self._timer = threading.Timer(delay, self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            remaining = self._last_event + self.debounce - time.monotonic()
+            if remaining > 0:
+                self._start_timer(remaining)
+                return
+            self._timer = None
+        self.flush()
+
+    def flush(self) -> None:
+        """Deliver pending events now, in the order their paths first changed."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        wall, mono = datetime.utcnow(), time.monotonic()
+        for path, (change_type, at) in pending.items():
+            ts = wall - timedelta(seconds=mono - at)
+            self.callback(FileChangeEvent(file_path=path, change_type=change_type, timestamp=ts))
+
+    def close(self) -> None:
+        """Cancel the timer and deliver whatever is still pending."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self.flush()
 
     def _should_ignore(self, path: str) -> bool:
-        for pattern in IGNORE_PATTERNS:
-            if pattern in path:
-                return True
-        return False
+        return _IGNORE_RE.search(path) is not None
 
-    def on_modified(self, event: FileSystemEvent):
-        if event.is_directory or self._should_ignore(str(event.src_path)):
+    def _handle(self, event: FileSystemEvent, change_type: str) -> None:
+        if event.is_directory:
             return
-        self.callback(FileChangeEvent(
-            file_path=str(event.src_path),
-            change_type="modified",
-            timestamp=datetime.utcnow(),
-        ))
+        path = os.fsdecode(event.src_path)
+        if not self._should_ignore(path):
+            self._enqueue(path, change_type)
+
+    def on_modified(self, event: FileSystemEvent):
+        self._handle(event, "modified")
 
     def on_created(self, event: FileSystemEvent):
-        if event.is_directory or self._should_ignore(str(event.src_path)):
-            return
-        self.callback(FileChangeEvent(
-            file_path=str(event.src_path),
-            change_type="added",
-            timestamp=datetime.utcnow(),
-        ))
+        self._handle(event, "added")
 
     def on_deleted(self, event: FileSystemEvent):
-        if event.is_directory or self._should_ignore(str(event.src_path)):
-            return
-        self.callback(FileChangeEvent(
-            file_path=str(event.src_path),
-            change_type="deleted",
-            timestamp=datetime.utcnow(),
-        ))
+        self._handle(event, "deleted")
 
 
 class GitRepoWatcher:
@@ -274,11 +423,16 @@ class GitRepoWatcher:
         self.repo_path = repo_path
         self.on_change = on_change
         self._observer: Optional[Observer] = None
+        self._handler: Optional[RepoFileHandler] = None
 
     def start(self):
         handler = RepoFileHandler(self.on_change)
+        self._handler = handler
         self._observer = Observer()
-        self._observer.schedule(handler, self.repo_path, recursive=True)
+        # Subscribe only to the events RepoFileHandler acts on. On Linux this
+        # narrows the inotify mask itself, so the opens/closes/reads of every
+        # file a build or test run touches are never queued by the kernel.
+        self._observer.schedule(handler, self.repo_path, recursive=True, event_filter=WATCHED_EVENTS)
         self._observer.start()
         logger.info("Git watcher started for: %s", self.repo_path)
 
@@ -287,6 +441,8 @@ class GitRepoWatcher:
             self._observer.stop()
             self._observer.join()
             self._observer = None
+            self._handler.close()
+            self._handler = None
             logger.info("Git watcher stopped")
 
     @property
@@ -32,18 +32,42 @@ Kiro (by Amazon) is a VS Code-based AI IDE. It stores conversation data in:
 from __future__ import annotations
 
 import base64
+import contextlib
+import functools
 import glob
-import json
+import hashlib
 import logging
+import os
 import platform
+import tempfile
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+from adapters._io import PREFETCH_MIN_FILES, iter_lines, map_threaded, prefetch, scan_dir, walk_files
+from adapters._json import JSON_ERRORS, dumps, loads
+from adapters._sqlite import connect_ro
 from adapters.base import BaseAdapter, RawConversation, SniffLayer
 
 logger = logging.getLogger("openbbox.kiro")
 
+# Message roles accepted by the generic ItemTable parser.
+_USER_ROLES = frozenset(("user", "human"))
+_ASSISTANT_ROLES = frozenset(("assistant", "ai", "bot"))
+
+# Kiro's directory-name base64 spells "+" as "-" and "=" padding as "_".
+_B64_DIRNAME = str.maketrans("-_", "+=")
+
+# Q Chat API log blocks are separated by lines holding just this marker.
+_QCHAT_SEP = b"=" * 31
+
+# Parsed Q Chat logs, kept between runs, one JSON file per log: {"path",
+# "size", "mtime_ns", "ino", "anchor", "offset" (start of the unfinished last
+# block), "conv_id" (conversation the next response belongs to at that
+# offset), "entries" (responses of the finished blocks), "tail" (responses of
+# the last block)}.
+_QCHAT_CACHE_DIR = Path.home() / ".openbbox" / "cache" / "kiro_qchat"
+
 
 def _kiro_app_support() -> Path:
     system = platform.system()
@@ -82,15 +106,12 @@ class KiroAdapter(BaseAdapter):
         if agent_dir.exists():
             ws_sessions = agent_dir / "workspace-sessions"
             if ws_sessions.exists():
-                for f in ws_sessions.rglob("*.json"):
-                    paths.append(str(f))
+                paths.extend(walk_files(ws_sessions, ".json"))
 
-        ws_dir = _kiro_workspace_storage()
-        if ws_dir.exists():
-            for sub in ws_dir.iterdir():
-                db = sub / "state.vscdb"
-                if db.exists():
-                    paths.append(str(db))
+        for entry in scan_dir(_kiro_workspace_storage()):
+            db_path = os.path.join(entry.path, "state.vscdb")
+            if os.path.exists(db_path):
+                paths.append(db_path)
         return paths
 
     def get_sniff_strategy(self) -> list[SniffLayer]:
@@ -114,10 +135,6 @@ class KiroAdapter(BaseAdapter):
     def poll_new(self, since: Optional[datetime] = None) -> list[RawConversation]:
         return self.poll_with_progress(since=since)
 
-    def poll_with_progress(self, since=None, on_progress=None):
-        result = super().poll_with_progress(since=since, on_progress=on_progress)
-        return self._deduplicate(result)
-
     # ── Layer 1: Workspace Sessions (kiro.kiroagent) ──
 
     def _layer_workspace_sessions(self, since: Optional[datetime] = None) -> list[RawConversation]:
@@ -126,20 +143,21 @@ class KiroAdapter(BaseAdapter):
         if not ws_sessions_dir.exists():
             return results
 
-        for project_dir in ws_sessions_dir.iterdir():
-            if not project_dir.is_dir():
+        # (session file, id, title, created, project name, project path)
+        jobs: list[tuple[str, str, str, Optional[datetime], str, Optional[str]]] = []
+        for project_entry in scan_dir(ws_sessions_dir):
+            if not project_entry.is_dir():
                 continue
 
-            project_path = self._decode_b64_dirname(project_dir.name)
-            project_name = Path(project_path).name if project_path else project_dir.name
-
-            sessions_file = project_dir / "sessions.json"
-            if not sessions_file.exists():
-                continue
+            project_path = self._decode_b64_dirname(project_entry.name)
+            project_name = Path(project_path).name if project_path else project_entry.name
 
+            # Open directly: a project without sessions.json costs one failed
+            # open instead of a stat and then an open.
             try:
-                sessions = json.loads(sessions_file.read_text(encoding="utf-8"))
-            except (json.JSONDecodeError, OSError):
+                with open(os.path.join(project_entry.path, "sessions.json"), "rb") as f:
+                    sessions = loads(f.read())
+            except (*JSON_ERRORS, OSError):
                 continue
 
             if not isinstance(sessions, list):
@@ -149,19 +167,32 @@ class KiroAdapter(BaseAdapter):
                 if not isinstance(session_meta, dict):
                     continue
                 session_id = session_meta.get("sessionId", "")
-                session_title = session_meta.get("title", "")
-                date_created = session_meta.get("dateCreated")
-
-                session_file = project_dir / f"{session_id}.json"
-                if not session_file.exists():
+                session_ts = self._parse_ts_value(session_meta.get("dateCreated"))
+                # Every turn is stamped with the session's creation time, so a
+                # session created before `since` is skipped without reading it.
+                if since and session_ts is not None and session_ts < since:
                     continue
 
-                convos = self._parse_session_file(
-                    session_file, since, session_id, session_title, date_created
-                )
+                # A missing session file fails the open inside the parser.
+                jobs.append((
+                    os.path.join(project_entry.path, f"{session_id}.json"),
+                    session_id, session_meta.get("title", ""), session_ts,
+                    project_name, project_path,
+                ))
+
+        if jobs:
+            # (Re)load the shared Q Chat responses once per scan, before
+            # fanning out: the workers only read them, and an instance reused
+            # across polls picks up responses logged since the last one.
+            self._qchat_cache = self._parse_all_qchat_logs()
+            if len(jobs) >= PREFETCH_MIN_FILES:
+                prefetch(job[0] for job in jobs)
+
+            parsed = map_threaded(lambda job: self._parse_session_file(job[0], since, *job[1:4]), jobs)
+            for job, convos in zip(jobs, parsed):
                 for c in convos:
-                    c.project_name = project_name
-                    c.project_path = project_path
+                    c.project_name = job[4]
+                    c.project_path = job[5]
                 results.extend(convos)
 
         logger.info("[workspace_sessions] Found %d conversations", len(results))
@@ -169,23 +200,24 @@ class KiroAdapter(BaseAdapter):
 
     def _parse_session_file(
         self,
-        path: Path,
+        path: str,
         since: Optional[datetime],
         session_id: str,
         session_title: str,
-        date_created: str | None,
+        session_ts: Optional[datetime],
     ) -> list[RawConversation]:
         results: list[RawConversation] = []
         try:
-            data = json.loads(path.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError):
+            with open(path, "rb") as f:
+                data = loads(f.read())
+        except (*JSON_ERRORS, OSError):
             return results
 
         history = data.get("history", [])
         if not isinstance(history, list):
             return results
 
-        session_ts = self._parse_ts_value(date_created) or datetime.utcnow()
+        session_ts = session_ts or datetime.utcnow()
 
         log_responses = self._load_qchat_responses(session_id)
         resp_idx = 0
@@ -243,9 +275,12 @@ class KiroAdapter(BaseAdapter):
     @staticmethod
     def _extract_message_content(message: dict) -> str:
         content = message.get("content", "")
-        if isinstance(content, str):
+        # Decoded JSON only holds exact built-in types, so an identity check
+        # on type() does instead of isinstance().
+        kind = type(content)
+        if kind is str:
             return content.strip()
-        if isinstance(content, list):
+        if kind is list:
             parts = []
             for block in content:
                 if isinstance(block, dict):
@@ -259,54 +294,60 @@ class KiroAdapter(BaseAdapter):
     # ── Layer 2: Workspace DBs ──
 
     def _layer_workspace_dbs(self, since: Optional[datetime] = None) -> list[RawConversation]:
-        import sqlite3
         results: list[RawConversation] = []
         ws_dir = _kiro_workspace_storage()
         if not ws_dir.exists():
             return results
 
-        for sub in ws_dir.iterdir():
-            if not sub.is_dir():
-                continue
-            db_path = sub / "state.vscdb"
-            if not db_path.exists():
+        # (workspace dir, its state.vscdb) for every workspace with a DB
+        jobs: list[tuple[str, str]] = []
+        for entry in scan_dir(ws_dir):
+            if not entry.is_dir():
                 continue
+            db_path = os.path.join(entry.path, "state.vscdb")
+            if os.path.exists(db_path):
+                jobs.append((entry.path, db_path))
 
-            project_name, project_path = self._resolve_workspace_project(sub)
+        for convos in map_threaded(lambda job: self._scan_workspace(*job, since), jobs):
+            results.extend(convos)
 
-            try:
-                conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-                conn.row_factory = sqlite3.Row
-
-                tables = {r[0] for r in conn.execute(
-                    "SELECT name FROM sqlite_master WHERE type='table'"
-                ).fetchall()}
+        logger.info("[workspace_db] Found %d conversations", len(results))
+        return results
 
-                if "ItemTable" not in tables:
-                    conn.close()
-                    continue
+    def _scan_workspace(self, ws_dir: str, db_path: str, since: Optional[datetime]) -> list[RawConversation]:
+        results: list[RawConversation] = []
+        project_name, project_path = self._resolve_workspace_project(Path(ws_dir))
 
-                rows = conn.execute("SELECT key, value FROM ItemTable").fetchall()
-                for row in rows:
-                    key = row["key"]
-                    value = row["value"]
+        try:
+            # closing() releases the connection on every exit, including a
+            # failure halfway through the rows.
+            with contextlib.closing(connect_ro(db_path)) as conn:
+                has_items = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type='table' AND name='ItemTable'"
+                ).fetchone()
+                if not has_items:
+                    return results
+
+                # The key filter runs in SQLite, so unrelated settings rows never
+                # cross into Python. LIKE is ASCII case-insensitive.
+                rows = conn.execute(
+                    "SELECT value FROM ItemTable "
+                    "WHERE key LIKE '%chat%' OR key LIKE '%composer%' OR key LIKE '%kiro%'"
+                )
+                for (value,) in rows:
                     if not value or not isinstance(value, str):
                         continue
-                    if "chat" in key.lower() or "composer" in key.lower() or "kiro" in key.lower():
-                        try:
-                            data = json.loads(value)
-                            convos = self._parse_generic_messages(data, since)
-                            for c in convos:
-                                c.project_name = project_name
-                                c.project_path = project_path
-                            results.extend(convos)
-                        except (json.JSONDecodeError, TypeError):
-                            continue
-                conn.close()
-            except Exception as e:
-                logger.debug("Failed to read Kiro DB %s: %s", db_path, e)
-
-        logger.info("[workspace_db] Found %d conversations", len(results))
+                    try:
+                        data = loads(value)
+                        convos = self._parse_generic_messages(data, since)
+                        for c in convos:
+                            c.project_name = project_name
+                            c.project_path = project_path
+                        results.extend(convos)
+                    except (*JSON_ERRORS, TypeError):
+                        continue
+        except Exception as e:
+            logger.debug("Failed to read Kiro DB %s: %s", db_path, e)
         return results
 
     def _parse_generic_messages(self, data, since: Optional[datetime]) -> list[RawConversation]:
@@ -329,10 +370,10 @@ class KiroAdapter(BaseAdapter):
                 continue
             role = msg.get("role", msg.get("type", ""))
             content = self._extract_message_content(msg) or msg.get("text", "")
-            if not content:
+            if not content or type(role) is not str:
                 continue
 
-            if role in ("user", "human"):
+            if role in _USER_ROLES:
                 if prompt_buf and response_buf:
                     if not since or ts >= since:
                         results.append(RawConversation(
@@ -340,7 +381,7 @@ class KiroAdapter(BaseAdapter):
                         ))
                 prompt_buf = content
                 response_buf = ""
-            elif role in ("assistant", "ai", "bot"):
+            elif role in _ASSISTANT_ROLES:
                 response_buf += content + "\n"
 
         if prompt_buf and response_buf:
@@ -353,6 +394,8 @@ class KiroAdapter(BaseAdapter):
     # ── Q Chat API Log Parsing ──
 
     _qchat_cache: dict[str, list[str]] | None = None
+    # Parsed Q Chat logs by path: read from disk on first use, then kept here.
+    _qchat_records: dict[str, dict] | None = None
 
     def _load_qchat_responses(self, session_id: str) -> list[str]:
         """Load real AI responses from Kiro Q Chat API logs, keyed by conversationId."""
@@ -360,78 +403,75 @@ class KiroAdapter(BaseAdapter):
             self._qchat_cache = self._parse_all_qchat_logs()
         return self._qchat_cache.get(session_id, [])
 
-    @staticmethod
-    def _parse_all_qchat_logs() -> dict[str, list[str]]:
-        """Parse all Q Chat API log files and group responses by conversationId."""
+    def _parse_all_qchat_logs(self) -> dict[str, list[str]]:
+        """
+        Parse all Q Chat API log files and group responses by conversationId.
+        Logs unchanged since the last call (or, on the first call, the last
+        run) are not read again; logs that only grew are parsed from where the
+        previous parse stopped. Only records that changed are written back.
+        """
         result: dict[str, list[str]] = {}
         logs_dir = _kiro_app_support().parent / "logs"
         if not logs_dir.exists():
             return result
 
+        if self._qchat_records is None:
+            self._qchat_records = _load_qchat_cache()
+        cache = self._qchat_records
+        fresh: dict[str, dict] = {}
+
         log_files = glob.glob(str(logs_dir / "**" / "*Q Chat API*"), recursive=True)
         for log_path in log_files:
             try:
-                with open(log_path, "r", encoding="utf-8") as f:
-                    content = f.read()
+                st = os.stat(log_path)
             except OSError:
                 continue
-
-            conv_id_for_next_resp = ""
-            for block in content.split("=" * 31):
-                block = block.strip()
-                if not block:
-                    continue
-                try:
-                    data = json.loads(block)
-                except (json.JSONDecodeError, ValueError):
+            record = cache.get(log_path)
+            # A malformed record (corrupt or older cache file) is a miss, as is
+            # a different file at the same path (rotated or recreated log).
+            if not _is_qchat_record(record) or record["ino"] != st.st_ino:
+                record = None
+            if record is None or record["size"] != st.st_size or record["mtime_ns"] != st.st_mtime_ns:
+                # Logs only grow; anything else (shorter, or truncated and
+                # regrown so the bytes before the offset differ) is parsed
+                # from the start.
+                if record is not None and (
+                    record["offset"] > st.st_size
+                    or _qchat_anchor(log_path, record["offset"]) != record["anchor"]
+                ):
+                    record = None
+                record = _scan_qchat_log(log_path, record)
+                if record is None:
                     continue
-
-                if "request" in data:
-                    cs = data["request"].get("conversationState", {})
-                    conv_id_for_next_resp = cs.get("conversationId", "")
-                elif "response" in data and conv_id_for_next_resp:
-                    r = data["response"]
-                    full = r.get("fullResponse", "")
-                    events = r.get("events", [])
-                    parts = []
-                    for ev in events:
-                        are = ev.get("assistantResponseEvent")
-                        if are:
-                            parts.append(are.get("content", ""))
-                        tue = ev.get("toolUseEvent")
-                        if tue:
-                            name = tue.get("name", "unknown")
-                            parts.append(f"[Tool: {name}]")
-                    text = "".join(parts) if parts else full
-                    if text.startswith("```json") and len(text) < 100:
-                        continue
-                    stripped = text.strip().strip("`").strip()
-                    if stripped.startswith('json\n'):
-                        stripped = stripped[5:].strip()
-                    if stripped.startswith("{") and stripped.endswith("}") and len(stripped) < 100:
-                        try:
-                            obj = json.loads(stripped)
-                            if isinstance(obj, dict) and {"chat", "do", "spec"} & set(obj.keys()):
-                                continue
-                        except (json.JSONDecodeError, ValueError):
-                            pass
-                    if text.strip():
-                        result.setdefault(conv_id_for_next_resp, []).append(text.strip())
-
+                record["size"], record["mtime_ns"], record["ino"] = st.st_size, st.st_mtime_ns, st.st_ino
+                record["anchor"] = _qchat_anchor(log_path, record["offset"])
+                _save_qchat_record(log_path, record)
+            fresh[log_path] = record
+
+            for entries in (record["entries"], record["tail"]):
+                for conv_id, texts in entries.items():
+                    result.setdefault(conv_id, []).extend(texts)
+
+        for log_path in cache.keys() - fresh.keys():
+            with contextlib.suppress(OSError):
+                os.unlink(_qchat_cache_file(log_path))
+        self._qchat_records = fresh
         return result
 
     # ── Helpers ──
 
     @staticmethod
+    @functools.lru_cache(maxsize=512)
     def _decode_b64_dirname(encoded: str) -> str:
-        """Kiro encodes workspace paths as URL-safe base64 directory names."""
+        """
+        Kiro encodes workspace paths as URL-safe base64 directory names.
+        Cached: the same project dirs are decoded again on every poll.
+        """
         try:
-            padded = encoded.replace("_", "=").replace("-", "+")
-            padding = 4 - len(padded) % 4
-            if padding != 4:
-                padded += "=" * padding
+            padded = encoded.translate(_B64_DIRNAME)
+            padded += "=" * (-len(padded) % 4)
             return base64.b64decode(padded).decode("utf-8")
-        except Exception:
+        except (ValueError, UnicodeDecodeError):  # binascii.Error is a ValueError
             return encoded
 
     @staticmethod
@@ -439,13 +479,13 @@ class KiroAdapter(BaseAdapter):
         ws_json = ws_dir / "workspace.json"
         if ws_json.exists():
             try:
-                data = json.loads(ws_json.read_text(encoding="utf-8"))
+                data = loads(ws_json.read_bytes())
                 folder = data.get("folder", "")
                 if folder.startswith("file://"):
                     from urllib.parse import unquote
                     decoded = unquote(folder[7:])
                     return Path(decoded).name, decoded
-            except (json.JSONDecodeError, OSError):
+            except (*JSON_ERRORS, OSError):
                 pass
         return ws_dir.name, ""
 
@@ -465,13 +505,166 @@ class KiroAdapter(BaseAdapter):
         except (ValueError, OSError, TypeError):
             return None
 
-    @staticmethod
-    def _deduplicate(conversations: list[RawConversation]) -> list[RawConversation]:
-        seen: set[str] = set()
-        unique: list[RawConversation] = []
-        for convo in conversations:
-            key = convo.prompt[:200].strip()
-            if key and key not in seen:
-                seen.add(key)
-                unique.append(convo)
-        return unique
+
+# ── Q Chat log cache ──
+
+def _qchat_cache_file(log_path: str) -> Path:
+    digest = hashlib.blake2b(log_path.encode("utf-8", "surrogateescape"), digest_size=16).hexdigest()
+    return _QCHAT_CACHE_DIR / f"{digest}.json"
+
+
+def _load_qchat_cache() -> dict[str, dict]:
+    """All cached records by log path; unreadable files are skipped."""
+    cache: dict[str, dict] = {}
+    for entry in scan_dir(_QCHAT_CACHE_DIR):
+        if not entry.name.endswith(".json"):
+            continue
+        try:
+            with open(entry.path, "rb") as f:
+                record = loads(f.read())
+        except (*JSON_ERRORS, OSError):
+            continue
+        if isinstance(record, dict) and type(record.get("path")) is str:
+            cache[record.pop("path")] = record
+    return cache
+
+
+def _is_qchat_record(record) -> bool:
+    """Whether a cached record has the shape _parse_all_qchat_logs relies on."""
+    if not isinstance(record, dict):
+        return False
+    for field in ("size", "mtime_ns", "ino", "offset"):
+        if type(record.get(field)) is not int:
+            return False
+    if type(record.get("conv_id")) is not str or type(record.get("anchor")) is not str:
+        return False
+    for field in ("entries", "tail"):
+        entries = record.get(field)
+        if not isinstance(entries, dict):
+            return False
+        for texts in entries.values():
+            if not isinstance(texts, list) or not all(type(t) is str for t in texts):
+                return False
+    return True
+
+
+def _qchat_anchor(log_path: str, offset: int) -> str:
+    """Hex of the (up to) 64 bytes before `offset`, to check a resume point."""
+    start = max(0, offset - 64)
+    try:
+        with open(log_path, "rb") as f:
+            f.seek(start)
+            return f.read(offset - start).hex()
+    except OSError:
+        return ""
+
+
+def _save_qchat_record(log_path: str, record: dict) -> None:
+    """
+    Write one log's record atomically. The temp file has a unique name, so
+    processes saving the same record at once cannot clobber each other's.
+    """
+    path = _qchat_cache_file(log_path)
+    tmp = None
+    try:
+        _QCHAT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=_QCHAT_CACHE_DIR, suffix=".tmp", delete=False,
+        ) as f:
+            tmp = f.name
+            f.write(dumps({"path": log_path, **record}))
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.debug("Failed to write Q Chat cache %s: %s", path, e)
+        if tmp is not None:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+
+
+def _scan_qchat_log(log_path: str, record: Optional[dict]) -> Optional[dict]:
+    """
+    Parse a Q Chat log from `record`'s offset (from the start if None) and
+    return the updated record. Only blocks closed by a separator advance the
+    offset; the last block may still be being written and is re-read next time.
+
+    The log is streamed line by line, so only the block being assembled is
+    held in memory rather than the whole file plus its split() list.
+    """
+    offset = record["offset"] if record else 0
+    conv_id = record["conv_id"] if record else ""
+    entries = {k: list(v) for k, v in record["entries"].items()} if record else {}
+    block: list[bytes] = []
+    pos = offset
+    try:
+        for line in iter_lines(log_path, offset=offset, partial=False):
+            pos += len(line) + 1
+            if line.strip() == _QCHAT_SEP:
+                conv_id = _qchat_block(b"\n".join(block), conv_id, entries)
+                block = []
+                offset = pos
+            else:
+                block.append(line)
+        # Whatever follows the last newline, read where it actually ends.
+        with open(log_path, "rb") as f:
+            f.seek(pos)
+            rest = f.read()
+    except OSError:
+        return None
+    if rest.strip() == _QCHAT_SEP:
+        conv_id = _qchat_block(b"\n".join(block), conv_id, entries)
+        block = []
+        offset = pos + len(rest)
+    elif rest:
+        block.append(rest)
+
+    tail: dict[str, list[str]] = {}
+    _qchat_block(b"\n".join(block), conv_id, tail)
+    return {"offset": offset, "conv_id": conv_id, "entries": entries, "tail": tail}
+
+
+def _qchat_block(block: bytes, conv_id: str, entries: dict[str, list[str]]) -> str:
+    """
+    Apply one log block: a request sets the conversation the following
+    responses belong to, a response is appended to `entries` under it.
+    Returns the conversation id in effect after the block.
+    """
+    block = block.strip()
+    if not block:
+        return conv_id
+    try:
+        data = loads(block)
+    except (*JSON_ERRORS, ValueError):
+        return conv_id
+
+    if "request" in data:
+        cs = data["request"].get("conversationState", {})
+        return cs.get("conversationId", "")
+    if "response" in data and conv_id:
+        r = data["response"]
+        full = r.get("fullResponse", "")
+        events = r.get("events", [])
+        parts = []
+        for ev in events:
+            are = ev.get("assistantResponseEvent")
+            if are:
+                parts.append(are.get("content", ""))
+            tue = ev.get("toolUseEvent")
+            if tue:
+                name = tue.get("name", "unknown")
+                parts.append(f"[Tool: {name}]")
+        text = "".join(parts) if parts else full
+        if text.startswith("```json") and len(text) < 100:
+            return conv_id
+        stripped = text.strip().strip("`").strip()
+        if stripped.startswith('json\n'):
+            stripped = stripped[5:].strip()
+        if stripped.startswith("{") and stripped.endswith("}") and len(stripped) < 100:
+            try:
+                obj = loads(stripped)
+                if isinstance(obj, dict) and {"chat", "do", "spec"} & set(obj.keys()):
+                    return conv_id
+            except (*JSON_ERRORS, ValueError):
+                pass
+        if text.strip():
+            entries.setdefault(conv_id, []).append(text.strip())
+    return conv_id
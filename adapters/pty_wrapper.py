@@ -11,11 +11,11 @@ Usage:
 
 from __future__ import annotations
 
-import io
 import os
 import platform
 import re
 import select
+import selectors
 import signal
 import sys
 from datetime import datetime
@@ -32,6 +32,16 @@ if IS_UNIX:
     import termios
     import tty
 
+# ANSI escapes stripped from captured output: CSI sequences (colors, cursor
+# moves) and OSC sequences (window titles, hyperlinks), compiled once. They
+# are pure ASCII, so they match the raw bytes the same as the decoded text.
+_ANSI_CSI = re.compile(rb"\x1b\[[0-9;]*[a-zA-Z]")
+_ANSI_OSC = re.compile(rb"\x1b\][^\x07]*\x07")
+
+# Bytes per PTY read: large enough that a streamed response is relayed in a
+# few reads (the kernel's pipe/tty buffers top out around 64 KiB).
+_PTY_READ_SIZE = 65536
+
 
 class PTYWrapper:
     """
@@ -53,7 +63,9 @@ class PTYWrapper:
         self.prompt_re = re.compile(prompt_pattern, re.MULTILINE | re.IGNORECASE)
         self.response_re = re.compile(response_pattern, re.MULTILINE | re.IGNORECASE)
 
-        self._output_buffer = io.StringIO()
+        # Captured output as raw bytes: appending is amortized O(1) and the
+        # text is decoded once per prompt boundary instead of once per read.
+        self._output_buffer = bytearray()
         self._current_prompt = ""
         self._current_response = ""
         self._last_prompt_time: Optional[datetime] = None
@@ -113,65 +125,93 @@ class PTYWrapper:
         old_settings = termios.tcgetattr(stdin_fd)
         try:
             tty.setraw(stdin_fd)
-
-            while True:
-                readable, _, _ = select.select([stdin_fd, master_fd], [], [], 0.1)
-
-                for fd in readable:
-                    if fd == stdin_fd:
-                        # User input -> forward to child
-                        data = os.read(stdin_fd, 4096)
-                        if not data:
+            # Non-blocking so a burst of output is drained in one wake-up
+            # without the last read stalling on an empty PTY.
+            os.set_blocking(master_fd, False)
+
+            # Registered once; the wait blocks until either side has data
+            # (epoll/kqueue where available) instead of polling every 100 ms.
+            with selectors.DefaultSelector() as sel:
+                sel.register(stdin_fd, selectors.EVENT_READ)
+                sel.register(master_fd, selectors.EVENT_READ)
+                while True:
+                    for key, _ in sel.select():
+                        if self._relay(key.fd, stdin_fd, master_fd):
                             return
-                        os.write(master_fd, data)
-                        # Capture user input for prompt detection
-                        self._process_input(data)
-
-                    elif fd == master_fd:
-                        # Child output -> forward to user's terminal + capture
-                        try:
-                            data = os.read(master_fd, 4096)
-                        except OSError:
-                            return
-                        if not data:
-                            return
-                        os.write(sys.stdout.fileno(), data)
-                        # Capture output for response detection
-                        self._process_output(data)
 
         finally:
             termios.tcsetattr(stdin_fd, termios.TCSADRAIN, old_settings)
 
+    def _relay(self, fd: int, stdin_fd: int, master_fd: int) -> bool:
+        """Forward what is readable on `fd`; True once either side hits EOF."""
+        if fd == stdin_fd:
+            # User input -> forward to child
+            data = os.read(stdin_fd, _PTY_READ_SIZE)
+            if not data:
+                return True
+            self._write_all(master_fd, data)
+            # Capture user input for prompt detection
+            self._process_input(data)
+            return False
+
+        # Child output -> forward to user's terminal + capture
+        while True:
+            try:
+                data = os.read(master_fd, _PTY_READ_SIZE)
+            except BlockingIOError:
+                return False
+            except OSError:
+                return True
+            if not data:
+                return True
+            self._write_all(sys.stdout.fileno(), data)
+            # Capture output for response detection
+            self._process_output(data)
+
+    @staticmethod
+    def _write_all(fd: int, data: bytes):
+        """Write all of `data`, waiting out a full non-blocking PTY buffer."""
+        view = memoryview(data)
+        while view:
+            try:
+                view = view[os.write(fd, view):]
+            except BlockingIOError:
+                select.select([], [fd], [])
+
     def _process_input(self, data: bytes):
         """Process user input to detect prompt boundaries."""
+        # Newline usually means the user submitted a prompt. Checked on the
+        # raw bytes: keystrokes need no decoding, and the buffer is decoded
+        # only when it holds more than ASCII whitespace.
         try:
-            text = data.decode("utf-8", errors="replace")
-            # Newline usually means the user submitted a prompt
-            if "\r" in text or "\n" in text:
-                buf = self._output_buffer.getvalue()
-                if buf.strip():
-                    self._flush_pending()
-                    self._current_prompt = buf.strip()
+            if (b"\r" in data or b"\n" in data) and self._output_buffer.strip():
+                buf = self._output_buffer.decode("utf-8", errors="replace").strip()
+                if buf:
+                    self._flush_pending(buf)
+                    self._current_prompt = buf
                     self._last_prompt_time = datetime.utcnow()
-                    self._output_buffer = io.StringIO()
+                    self._output_buffer.clear()
         except Exception:
             pass
 
     def _process_output(self, data: bytes):
         """Process child output to capture AI responses."""
         try:
-            text = data.decode("utf-8", errors="replace")
             # Strip ANSI escape codes for clean capture
-            clean = re.sub(r"\x1b\[[0-9;]*[a-zA-Z]", "", text)
-            clean = re.sub(r"\x1b\][^\x07]*\x07", "", clean)
-            self._output_buffer.write(clean)
+            self._output_buffer += _ANSI_OSC.sub(b"", _ANSI_CSI.sub(b"", data))
         except Exception:
             pass
 
-    def _flush_pending(self):
-        """If we have a prompt+response pair, emit it."""
-        if self._current_prompt and self._output_buffer.getvalue().strip():
-            response = self._output_buffer.getvalue().strip()
+    def _flush_pending(self, response: Optional[str] = None):
+        """
+        If we have a prompt+response pair, emit it. `response` is the output
+        buffer already decoded and stripped, when the caller has it.
+        """
+        if not self._current_prompt:
+            return
+        if response is None:
+            response = self._output_buffer.decode("utf-8", errors="replace").strip()
+        if response:
             if len(response) > 20:  # Ignore trivial output
                 convo = RawConversation(
                     timestamp=self._last_prompt_time or datetime.utcnow(),
@@ -182,7 +222,7 @@ class PTYWrapper:
                     self.on_exchange(convo)
 
             self._current_prompt = ""
-            self._output_buffer = io.StringIO()
+            self._output_buffer.clear()
 
     @staticmethod
     def _sync_terminal_size(master_fd: int):
@@ -6,6 +6,8 @@ Supports dynamic adapter loading and priority-based ordering.
 from __future__ import annotations
 
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from adapters.base import BaseAdapter
@@ -33,43 +35,86 @@ ALL_ADAPTERS: list[type[BaseAdapter]] = [
 ]
 
 
+# One instance per adapter class, created on first use and shared by every
+# lookup: constructors probe the filesystem, and adapters keep per-instance
+# parse caches that only pay off when the instance is reused across polls.
+_INSTANCES: dict[type[BaseAdapter], BaseAdapter] = {}
+_NAME_INDEX: dict[str, BaseAdapter] = {}
+_loaded = False
+_cache_lock = threading.Lock()
+
+
+def _instances() -> list[BaseAdapter]:
+    """Instantiate every registered adapter once, in ALL_ADAPTERS order."""
+    global _loaded
+    with _cache_lock:
+        if not _loaded:
+            for cls in ALL_ADAPTERS:
+                try:
+                    adapter = cls()
+                except Exception as e:
+                    logger.debug("Failed to initialize %s: %s", cls.__name__, e)
+                    continue
+                _INSTANCES[cls] = adapter
+                _NAME_INDEX[adapter.name().lower()] = adapter
+            _loaded = True
+        return list(_INSTANCES.values())
+
+
+def invalidate_adapter_cache() -> None:
+    """
+    Close and drop the shared instances so the next lookup re-creates (and
+    re-probes) them.
+    """
+    global _loaded
+    with _cache_lock:
+        dropped = list(_INSTANCES.values())
+        _INSTANCES.clear()
+        _NAME_INDEX.clear()
+        _loaded = False
+    for adapter in dropped:
+        try:
+            adapter.close()
+        except Exception as e:
+            logger.debug("Failed to close %s: %s", adapter.name(), e)
+
+
+def _detect(adapter: BaseAdapter) -> bool:
+    try:
+        return adapter.detect()
+    except Exception as e:
+        logger.debug("Failed to detect %s: %s", adapter.name(), e)
+        return False
+
+
 def get_available_adapters() -> list[BaseAdapter]:
     """Return instantiated adapters for IDEs detected on this machine."""
+    adapters = _instances()
+    if not adapters:
+        return []
+    # Each detect() probes a different IDE's directories, so they run side by
+    # side; map() keeps the result in ALL_ADAPTERS order.
+    with ThreadPoolExecutor(max_workers=len(adapters)) as pool:
+        detected = list(pool.map(_detect, adapters))
     available = []
-    for adapter_cls in ALL_ADAPTERS:
-        try:
-            adapter = adapter_cls()
-            if adapter.detect():
-                available.append(adapter)
-                logger.info("Detected: %s", adapter.name())
-        except Exception as e:
-            logger.debug("Failed to initialize %s: %s", adapter_cls.__name__, e)
+    for adapter, found in zip(adapters, detected):
+        if found:
+            available.append(adapter)
+            logger.info("Detected: %s", adapter.name())
     return available
 
 
 def get_all_adapters() -> list[BaseAdapter]:
     """Return all adapter instances regardless of detection."""
-    result = []
-    for cls in ALL_ADAPTERS:
-        try:
-            result.append(cls())
-        except Exception:
-            pass
-    return result
+    return _instances()
 
 
 def get_adapter_by_name(name: str) -> Optional[BaseAdapter]:
     """Return a specific adapter by IDE name (case-insensitive)."""
-    for cls in ALL_ADAPTERS:
-        try:
-            adapter = cls()
-            if adapter.name().lower() == name.lower():
-                return adapter
-        except Exception:
-            pass
-    return None
+    _instances()
+    return _NAME_INDEX.get(name.lower())
 
 
 def get_adapter_names() -> list[str]:
     """Return names of all registered adapters."""
-    return [cls().name() for cls in ALL_ADAPTERS]
+    return [adapter.name() for adapter in _instances()]
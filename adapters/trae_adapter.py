@@ -46,19 +46,28 @@ We CAN read user prompts from the workspace ItemTable.
 
 from __future__ import annotations
 
-import json
+import contextlib
 import logging
 import platform
+import re
 import sqlite3
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 from urllib.parse import unquote
 
+from adapters._json import JSON_ERRORS, loads
+from adapters._sqlite import connect_ro
 from adapters.base import BaseAdapter, RawConversation, SniffLayer
 
 logger = logging.getLogger("openbbox.trae")
 
+# ItemTable key holding Trae CN's prompt history
+_INPUT_HISTORY_KEY = "icube-ai-agent-storage-input-history"
+
+# Names of the key/value tables that may hold chat bubbles (cursorDiskKV etc.)
+_KV_TABLE_RE = re.compile(r"kv|disk", re.IGNORECASE)
+
 
 def _trae_variants() -> list[Path]:
     """
@@ -133,10 +142,6 @@ class TraeAdapter(BaseAdapter):
     def poll_new(self, since: Optional[datetime] = None) -> list[RawConversation]:
         return self.poll_with_progress(since=since)
 
-    def poll_with_progress(self, since=None, on_progress=None):
-        result = super().poll_with_progress(since=since, on_progress=on_progress)
-        return self._deduplicate(result)
-
     # ── Layer 1: Workspace DBs ──
 
     def _layer_workspace_dbs(self, since: Optional[datetime] = None) -> list[RawConversation]:
@@ -194,62 +199,79 @@ class TraeAdapter(BaseAdapter):
         """
         results: list[RawConversation] = []
         try:
-            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-            conn.row_factory = sqlite3.Row
-
-            tables = {r[0] for r in conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table'"
-            ).fetchall()}
-
-            if "ItemTable" not in tables:
-                conn.close()
-                return results
-
-            # Source 1: icube-ai-agent-storage-input-history (Trae CN specific)
-            row = conn.execute(
-                "SELECT value FROM ItemTable WHERE key='icube-ai-agent-storage-input-history'"
-            ).fetchone()
-            if row and row["value"]:
-                try:
-                    prompts = json.loads(row["value"])
-                    if isinstance(prompts, list):
-                        for i, entry in enumerate(prompts):
-                            text = entry.get("inputText", "")
-                            if not text or not text.strip():
-                                continue
-                            if since:
-                                pass  # no timestamp in prompt history, include all
-
-                            results.append(RawConversation(
-                                timestamp=datetime.utcnow(),
-                                prompt=text.strip(),
-                                response="[Trae AI response — stored in encrypted database]",
-                                model_name=self._detect_model(conn),
-                            ))
-                except (json.JSONDecodeError, TypeError):
-                    pass
-
-            # Source 2: KV-style tables (for international version)
-            kv_tables = [t for t in tables if "kv" in t.lower() or "disk" in t.lower()]
-            for table_name in kv_tables:
-                results.extend(self._read_kv_table(conn, table_name, since))
-
-            # Source 3: Generic chat/composer keys in ItemTable
-            for row in conn.execute("SELECT key, value FROM ItemTable").fetchall():
-                key = row["key"]
-                value = row["value"]
-                if not value or not isinstance(value, str):
-                    continue
-                if key in ("icube-ai-agent-storage-input-history",):
-                    continue  # already processed
-                if any(k in key.lower() for k in ("composer", "conversation")):
+            with contextlib.closing(connect_ro(db_path)) as conn:
+                conn.row_factory = sqlite3.Row
+
+                tables = {r[0] for r in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='table'"
+                ).fetchall()}
+
+                if "ItemTable" not in tables:
+                    return results
+
+                # One pass over the interesting ItemTable rows feeds every
+                # source below: the prompt history, the selected model and the
+                # generic chat/composer keys. The key filter runs in SQLite,
+                # so unrelated settings rows never cross into Python; LIKE is
+                # ASCII case-insensitive, instr() is not (like the old `in`).
+                history = None
+                model_values: list = []
+                conversation_values: list = []
+                rows = conn.execute(
+                    "SELECT key, value FROM ItemTable "
+                    "WHERE key = ? OR key LIKE '%composer%' OR key LIKE '%conversation%' "
+                    "OR instr(key, 'selected_model') > 0",
+                    (_INPUT_HISTORY_KEY,),
+                )
+                for key, value in rows:
+                    if key == _INPUT_HISTORY_KEY:
+                        history = value
+                        continue
+                    if "selected_model" in key:
+                        model_values.append(value)
+                    lowered = key.lower()
+                    if "composer" in lowered or "conversation" in lowered:
+                        conversation_values.append(value)
+
+                # Source 1: icube-ai-agent-storage-input-history (Trae CN specific)
+                if history:
+                    try:
+                        prompts = loads(history)
+                        if isinstance(prompts, list):
+                            # No timestamp in prompt history: include all,
+                            # stamped with the scan time.
+                            now = datetime.utcnow()
+                            model_name = None
+                            for entry in prompts:
+                                text = entry.get("inputText", "")
+                                if not text or not text.strip():
+                                    continue
+                                if model_name is None:
+                                    model_name = self._detect_model(model_values)
+
+                                results.append(RawConversation(
+                                    timestamp=now,
+                                    prompt=text.strip(),
+                                    response="[Trae AI response — stored in encrypted database]",
+                                    model_name=model_name,
+                                ))
+                    except (*JSON_ERRORS, TypeError):
+                        pass
+
+                # Source 2: KV-style tables (for international version)
+                kv_tables = [t for t in tables if _KV_TABLE_RE.search(t)]
+                for table_name in kv_tables:
+                    results.extend(self._read_kv_table(conn, table_name, since))
+
+                # Source 3: Generic chat/composer keys in ItemTable
+                for value in conversation_values:
+                    if not value or not isinstance(value, str):
+                        continue
                     try:
-                        data = json.loads(value)
+                        data = loads(value)
                         results.extend(self._parse_conversation_data(data, since))
-                    except (json.JSONDecodeError, TypeError):
+                    except (*JSON_ERRORS, TypeError):
                         continue
-
-            conn.close()
         except (sqlite3.OperationalError, sqlite3.DatabaseError) as e:
             logger.debug("Failed to read Trae workspace DB %s: %s", db_path, e)
         return results
@@ -260,22 +282,19 @@ class TraeAdapter(BaseAdapter):
         """Read from global DB — mainly metadata, may have some conversation data."""
         results: list[RawConversation] = []
         try:
-            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-            conn.row_factory = sqlite3.Row
-
-            tables = {r[0] for r in conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table'"
-            ).fetchall()}
+            with contextlib.closing(connect_ro(db_path)) as conn:
+                conn.row_factory = sqlite3.Row
 
-            if "ItemTable" not in tables:
-                conn.close()
-                return results
+                tables = {r[0] for r in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='table'"
+                ).fetchall()}
 
-            kv_tables = [t for t in tables if "kv" in t.lower() or "disk" in t.lower()]
-            for table_name in kv_tables:
-                results.extend(self._read_kv_table(conn, table_name, since))
+                if "ItemTable" not in tables:
+                    return results
 
-            conn.close()
+                kv_tables = [t for t in tables if _KV_TABLE_RE.search(t)]
+                for table_name in kv_tables:
+                    results.extend(self._read_kv_table(conn, table_name, since))
         except (sqlite3.OperationalError, sqlite3.DatabaseError) as e:
             logger.debug("Failed to read Trae global DB %s: %s", db_path, e)
         return results
@@ -295,11 +314,11 @@ class TraeAdapter(BaseAdapter):
                 if not value:
                     continue
                 try:
-                    data = json.loads(value)
+                    data = loads(value)
                     convo = self._parse_bubble(data, since)
                     if convo:
                         results.append(convo)
-                except (json.JSONDecodeError, TypeError):
+                except (*JSON_ERRORS, TypeError):
                     continue
         except sqlite3.OperationalError:
             pass
@@ -393,26 +412,27 @@ class TraeAdapter(BaseAdapter):
         ws_json = ws_dir / "workspace.json"
         if ws_json.exists():
             try:
-                data = json.loads(ws_json.read_text(encoding="utf-8"))
+                data = loads(ws_json.read_bytes())
                 folder = data.get("folder", "")
                 if folder.startswith("file://"):
                     decoded = unquote(folder[7:])
                     return Path(decoded).name, decoded
-            except (json.JSONDecodeError, OSError):
+            except (*JSON_ERRORS, OSError):
                 pass
         return ws_dir.name, ""
 
     @staticmethod
-    def _detect_model(conn: sqlite3.Connection) -> str:
-        """Try to detect which model Trae is using from settings."""
+    def _detect_model(values: list) -> str:
+        """
+        Try to detect which model Trae is using from settings: `values` are the
+        *selected_model* ItemTable values in table order.
+        """
         try:
-            for row in conn.execute("SELECT key, value FROM ItemTable").fetchall():
-                key = row["key"]
-                if "selected_model" in key:
-                    data = json.loads(row["value"])
-                    if isinstance(data, dict):
-                        return data.get("display_name", data.get("name", ""))
-        except (sqlite3.OperationalError, json.JSONDecodeError):
+            for value in values:
+                data = loads(value)
+                if isinstance(data, dict):
+                    return data.get("display_name", data.get("name", ""))
+        except (*JSON_ERRORS, TypeError):
             pass
         return ""
 
@@ -431,14 +451,3 @@ class TraeAdapter(BaseAdapter):
                 except (ValueError, OSError):
                     pass
         return None
-
-    @staticmethod
-    def _deduplicate(conversations: list[RawConversation]) -> list[RawConversation]:
-        seen: set[str] = set()
-        unique: list[RawConversation] = []
-        for convo in conversations:
-            key = convo.prompt[:200].strip()
-            if key and key not in seen:
-                seen.add(key)
-                unique.append(convo)
-        return unique
@@ -74,6 +74,9 @@ class TemporalMatcher:
         """
         now = datetime.utcnow()
         nodes: list[PulseNode] = []
+        # The working tree does not change between prompts of one flush, so
+        # git is asked for the diff once rather than once per prompt.
+        repo_diffs: Optional[list[FileDiff]] = None
 
         for convo, source_ide, project_id, project_name in self._pending_prompts:
             # Step 1: Find file changes in the time window
@@ -82,10 +85,12 @@ class TemporalMatcher:
             # Step 2: Get actual git diffs
             diffs: list[FileDiff] = []
             if git_capture:
-                # Prefer combined diff (staged + unstaged)
-                diffs = git_capture.get_combined_diff()
-                if not diffs:
-                    diffs = git_capture.get_unstaged_diff()
+                if repo_diffs is None:
+                    # Prefer combined diff (staged + unstaged)
+                    repo_diffs = git_capture.get_combined_diff()
+                    if not repo_diffs:
+                        repo_diffs = git_capture.get_unstaged_diff()
+                diffs = list(repo_diffs)
 
             # Step 3: If no git diffs, build from file change events
             if not diffs and matched_changes: